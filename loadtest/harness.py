@@ -0,0 +1,265 @@
+"""Load-test the FastAPI app against a local stub upstream.
+
+Starts a stub server per upstream host, launches `uvicorn main:app` with the
+scrapers pointed at them, drives the API at a target request rate and reports latency
+percentiles, throughput and server memory.
+
+    python -m loadtest.harness --rate 5 --duration 30 --throttle-rate 0.05
+"""
+import argparse
+import math
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from loadtest.stub_server import StubConfig, StubUpstreamServer
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+ENDPOINTS = ('top-cryptos', 'analyse', 'analyse-multiple', 'influencers')
+
+# Each upstream gets its own stub server, so the app paces them as separate hosts
+UPSTREAMS = ('coinmarketcap', 'twitter', 'influencers')
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def read_rss_kb(pid):
+    """Resident set size of a process and its children in KiB (Linux only).
+
+    Returns:
+        int: Total RSS, or None if /proc is unavailable
+    """
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            rss = next((int(line.split()[1]) for line in f if line.startswith('VmRSS:')), 0)
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            children = f.read().split()
+    except OSError:
+        return None
+
+    # uvicorn --workers N runs the app in child processes
+    for child in children:
+        rss += read_rss_kb(int(child)) or 0
+    return rss
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_app(coinmarketcap_url, twitter_url, port, workers=1):
+    """Start uvicorn serving main:app with the scrapers pointed at the stubs."""
+    env = dict(os.environ, COINMARKETCAP_URL=coinmarketcap_url, TWITTER_URL=twitter_url)
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'main:app', '--host', '127.0.0.1', '--port', str(port),
+         '--workers', str(workers), '--log-level', 'warning'],
+        cwd=SRC_DIR, env=env
+    )
+
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+        try:
+            requests.get(f"{base_url}/openapi.json", timeout=1)
+            return process, base_url
+        except requests.exceptions.RequestException:
+            time.sleep(0.2)
+
+    process.terminate()
+    raise RuntimeError("uvicorn did not start within 30 seconds")
+
+
+def build_request(endpoint, base_url, influencers_url, index, args):
+    """Return (method, url, params) for the index-th request to an endpoint."""
+    if endpoint == 'top-cryptos':
+        return 'GET', f"{base_url}/top-cryptos", {'limit': args.limit}
+    if endpoint == 'analyse':
+        return 'GET', f"{base_url}/analyse/stub_user_{index % args.usernames}", None
+    if endpoint == 'analyse-multiple':
+        usernames = [f"stub_user_{(index + i) % args.usernames}" for i in range(args.batch_size)]
+        params = {'usernames': usernames, 'delay': args.delay}
+        if args.deadline:
+            params['deadline'] = args.deadline
+        return 'POST', f"{base_url}/analyse-multiple", params
+    return 'GET', f"{base_url}/influencers", {'url': f"{influencers_url}/post/top-crypto-twitter-influencers"}
+
+
+def run_load(base_url, influencers_url, args, server_pid=None):
+    """Drive the endpoints at the target rate for the configured duration.
+
+    Requests are issued open-loop: one is scheduled every 1/rate seconds per
+    endpoint regardless of how long earlier ones take, so a slow server shows
+    up as growing latency rather than a lower offered load. Latency is measured
+    from the scheduled send time, so time spent waiting for a free client
+    worker counts against the server instead of being silently omitted; that
+    wait is also reported separately as send lag.
+
+    Returns:
+        dict: Per-endpoint results and server memory samples
+    """
+    latencies = defaultdict(list)
+    send_lags = defaultdict(list)
+    statuses = defaultdict(lambda: defaultdict(int))
+    lock = threading.Lock()
+    rss_samples = []
+    stop = threading.Event()
+
+    def sample_memory():
+        while not stop.is_set():
+            rss = read_rss_kb(server_pid) if server_pid else None
+            if rss is not None:
+                rss_samples.append(rss)
+            stop.wait(0.5)
+
+    def issue(endpoint, scheduled, method, url, params):
+        lag = time.perf_counter() - scheduled
+        try:
+            response = requests.request(method, url, params=params, timeout=args.timeout)
+            status = response.status_code
+        except requests.exceptions.RequestException as e:
+            status = type(e).__name__
+        elapsed = time.perf_counter() - scheduled
+        with lock:
+            latencies[endpoint].append(elapsed)
+            send_lags[endpoint].append(lag)
+            statuses[endpoint][status] += 1
+
+    sampler = threading.Thread(target=sample_memory, daemon=True)
+    sampler.start()
+
+    interval = 1.0 / args.rate
+    total = int(args.duration * args.rate)
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for index in range(total):
+            scheduled = started + index * interval
+            now = time.perf_counter()
+            if scheduled > now:
+                time.sleep(scheduled - now)
+            for endpoint in args.endpoints:
+                pool.submit(issue, endpoint, scheduled, *build_request(endpoint, base_url, influencers_url, index, args))
+
+    wall_time = time.perf_counter() - started
+    stop.set()
+    sampler.join()
+
+    return {
+        'wall_time': wall_time,
+        'latencies': dict(latencies),
+        'send_lags': dict(send_lags),
+        'statuses': {endpoint: dict(counts) for endpoint, counts in statuses.items()},
+        'rss_kb': rss_samples
+    }
+
+
+def format_report(results, stub_stats=None, late_threshold=0.01):
+    """Format load-test results as a plain-text table.
+
+    Args:
+        results (dict): Output of run_load
+        stub_stats (Counter): Upstream request counts by (kind, status)
+        late_threshold (float): Send lag in seconds above which a send counts as late
+    """
+    lines = [
+        f"{'endpoint':<18}{'requests':>9}{'ok':>7}{'req/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        f"{'late':>6}{'max lag ms':>12}  statuses",
+    ]
+    for endpoint, values in results['latencies'].items():
+        statuses = results['statuses'][endpoint]
+        lags = results['send_lags'][endpoint]
+        ok = statuses.get(200, 0)
+        late = sum(1 for lag in lags if lag > late_threshold)
+        lines.append(
+            f"{endpoint:<18}{len(values):>9}{ok:>7}{len(values) / results['wall_time']:>8.2f}"
+            f"{percentile(values, 50) * 1000:>9.0f}{percentile(values, 95) * 1000:>9.0f}"
+            f"{percentile(values, 99) * 1000:>9.0f}{late:>6}{max(lags, default=0) * 1000:>12.0f}  {statuses}"
+        )
+    if any(lag > late_threshold for lags in results['send_lags'].values() for lag in lags):
+        lines.append("warning: some sends started late; raise --concurrency so the offered rate is met")
+
+    rss = results['rss_kb']
+    if rss:
+        lines.append(f"server RSS: start {rss[0] / 1024:.1f} MiB, peak {max(rss) / 1024:.1f} MiB, "
+                     f"end {rss[-1] / 1024:.1f} MiB")
+
+    if stub_stats:
+        lines.append("upstream requests: " + ', '.join(
+            f"{kind} {status}: {count}" for (kind, status), count in sorted(stub_stats.items())
+        ))
+    return '\n'.join(lines)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rate', type=float, default=2.0, help="Requests per second per endpoint")
+    parser.add_argument('--duration', type=float, default=30.0, help="Test duration in seconds")
+    parser.add_argument('--concurrency', type=int, default=64, help="Maximum in-flight requests")
+    parser.add_argument('--timeout', type=float, default=120.0, help="Client timeout in seconds")
+    parser.add_argument('--endpoints', nargs='+', choices=ENDPOINTS,
+                        default=['top-cryptos', 'analyse', 'analyse-multiple'])
+    parser.add_argument('--limit', type=int, default=100, help="limit for /top-cryptos")
+    parser.add_argument('--usernames', type=int, default=1000, help="Distinct stub usernames to cycle through")
+    parser.add_argument('--batch-size', type=int, default=5, help="Usernames per /analyse-multiple call")
+    parser.add_argument('--delay', type=float, default=0.0, help="delay passed to /analyse-multiple")
+    parser.add_argument('--deadline', type=float, default=None, help="deadline passed to /analyse-multiple")
+    parser.add_argument('--workers', type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument('--latency', type=float, default=0.05, help="Stub mean latency in seconds")
+    parser.add_argument('--jitter', type=float, default=0.02, help="Stub latency jitter in seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of stub 500 responses")
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help="Fraction of stub 429 responses")
+    parser.add_argument('--retry-after', type=int, default=1, help="Retry-After seconds on stub 429s")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    config = StubConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after
+    )
+    stubs = {upstream: StubUpstreamServer(config=config).start() for upstream in UPSTREAMS}
+    process = None
+
+    try:
+        process, base_url = start_app(stubs['coinmarketcap'].url, stubs['twitter'].url, _free_port(),
+                                      workers=args.workers)
+        print(f"Driving {base_url} (upstream stubs at "
+              f"{', '.join(f'{upstream} {stub.url}' for upstream, stub in stubs.items())}) "
+              f"at {args.rate} req/s per endpoint for {args.duration}s...")
+        results = run_load(base_url, stubs['influencers'].url, args, server_pid=process.pid)
+        print(format_report(results, sum((stub.stats for stub in stubs.values()), Counter())))
+        print("rate control:", requests.get(f"{base_url}/metrics", timeout=5).json()['rate_control'])
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+        for stub in stubs.values():
+            stub.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+import hashlib
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+COINS = [
+    ('BTC', 'Bitcoin'), ('ETH', 'Ethereum'), ('USDT', 'Tether'), ('BNB', 'BNB'),
+    ('SOL', 'Solana'), ('USDC', 'USD Coin'), ('XRP', 'XRP'), ('ADA', 'Cardano'),
+    ('AVAX', 'Avalanche'), ('DOGE', 'Dogecoin'), ('DOT', 'Polkadot'), ('MATIC', 'Polygon'),
+    ('LINK', 'Chainlink'), ('LTC', 'Litecoin'), ('SHIB', 'Shiba Inu'), ('UNI', 'Uniswap'),
+    ('TRX', 'TRON'), ('ATOM', 'Cosmos'), ('XMR', 'Monero'), ('XLM', 'Stellar')
+]
+
+TWEET_TEMPLATES = [
+    "{name} looks bullish, accumulate before the breakout",
+    "Taking profit on {symbol}, the rally is overextended",
+    "{name} is in a downtrend, avoid until support holds",
+    "Long {symbol} here, huge upside potential",
+    "Watching {symbol} closely, no position yet",
+    "Sell {name} now, this is a bubble and a crash is coming"
+]
+
+
+class StubConfig:
+    """Behaviour of the stub upstream server."""
+
+    def __init__(self, latency=0.05, jitter=0.02, error_rate=0.0, throttle_rate=0.0,
+                 retry_after=1, tweets_per_profile=20, influencer_count=31):
+        """Initialize the configuration.
+
+        Args:
+            latency (float): Mean response latency in seconds
+            jitter (float): Maximum random deviation from the mean latency in seconds
+            error_rate (float): Fraction of requests answered with a 500
+            throttle_rate (float): Fraction of requests answered with a 429
+            retry_after (int): Retry-After value in seconds sent with 429s
+            tweets_per_profile (int): Number of tweets on each profile page
+            influencer_count (int): Number of handles on the influencer listing
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.tweets_per_profile = tweets_per_profile
+        self.influencer_count = influencer_count
+
+
+def _seeded_random(key):
+    """Return a Random seeded from a string, so pages are stable per URL."""
+    return random.Random(int(hashlib.sha256(key.encode('utf-8')).hexdigest()[:16], 16))
+
+
+def render_coinmarketcap(page):
+    """Render a CoinMarketCap-like listing page."""
+    rows = []
+    for offset, (symbol, name) in enumerate(COINS):
+        rank = (page - 1) * 100 + offset + 1
+        rows.append(
+            f'<tr><td>{rank}</td>'
+            f'<td><a class="cmc-link" href="/currencies/{name.lower()}/">{escape(name)}</a>'
+            f'<p class="coin-item-symbol">{symbol}</p></td></tr>'
+        )
+    return f"<html><body><table><tbody>{''.join(rows)}</tbody></table></body></html>"
+
+
+def render_twitter_page(username, tweet_count, with_profile=True):
+    """Render a Twitter profile or search page with crypto-related tweets."""
+    rng = _seeded_random(username)
+    tweets = []
+    for _ in range(tweet_count):
+        symbol, name = rng.choice(COINS)
+        text = rng.choice(TWEET_TEMPLATES).format(symbol=symbol, name=name)
+        tweets.append(
+            f'<article data-testid="tweet"><div data-testid="tweetText">{escape(text)}</div></article>'
+        )
+
+    profile = ''
+    title = 'Search / X'
+    if with_profile:
+        title = f'{escape(username)} (@{escape(username)}) / X'
+        profile = f'<div data-testid="UserDescription">Crypto trader. Bitcoin since 2013. @{escape(username)}</div>'
+
+    return f"<html><head><title>{title}</title></head><body>{profile}{''.join(tweets)}</body></html>"
+
+
+def render_influencer_listing(count):
+    """Render an AJ Marketing-like list of influencer handles."""
+    items = ''.join(
+        f'<div class="influencer"><h3>Influencer {i + 1}</h3><p>@stub_influencer_{i + 1}</p></div>'
+        for i in range(count)
+    )
+    return f"<html><body><section>{items}</section></body></html>"
+
+
+class StubUpstreamHandler(BaseHTTPRequestHandler):
+    """Serves CoinMarketCap, Twitter and AJ Marketing look-alike pages."""
+
+    def do_GET(self):
+        server = self.server
+        config = server.config
+        parsed = urlparse(self.path)
+
+        if parsed.path == '/' and 'page' in parse_qs(parsed.query):
+            kind = 'coinmarketcap'
+        elif parsed.path == '/search':
+            kind = 'twitter_search'
+        elif parsed.path.startswith('/post/'):
+            kind = 'influencers'
+        else:
+            kind = 'twitter_profile'
+
+        delay = config.latency + random.uniform(-config.jitter, config.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        roll = random.random()
+        if roll < config.throttle_rate:
+            server.record(kind, 429)
+            self._send(429, 'Rate limit exceeded', {'Retry-After': str(config.retry_after)})
+            return
+        if roll < config.throttle_rate + config.error_rate:
+            server.record(kind, 500)
+            self._send(500, 'Internal server error')
+            return
+
+        if kind == 'coinmarketcap':
+            body = render_coinmarketcap(int(parse_qs(parsed.query)['page'][0]))
+        elif kind == 'twitter_search':
+            query = parse_qs(parsed.query).get('q', [''])[0]
+            body = render_twitter_page(query.replace('from:', ''), config.tweets_per_profile, with_profile=False)
+        elif kind == 'influencers':
+            body = render_influencer_listing(config.influencer_count)
+        else:
+            body = render_twitter_page(parsed.path.strip('/'), config.tweets_per_profile)
+
+        server.record(kind, 200)
+        self._send(200, body)
+
+    def _send(self, status, body, headers=None):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubUpstreamServer(ThreadingHTTPServer):
+    """Threaded stub upstream server running in the background."""
+
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=0, config=None):
+        super().__init__((host, port), StubUpstreamHandler)
+        self.config = config or StubConfig()
+        self.stats = Counter()
+        self._stats_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def handle_error(self, request, client_address):
+        # Clients giving up on slow responses (timeouts, deadlines) are expected
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+    def record(self, kind, status):
+        with self._stats_lock:
+            self.stats[(kind, status)] += 1
+
+    def start(self):
+        """Serve requests in a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread:
+            self._thread.join()
@@ -1,33 +1,81 @@
-import random
+import hashlib
+import json
+import os
 import re
-import time
 from collections import Counter
-from datetime import datetime
 
 import requests
 from bs4 import BeautifulSoup
 
+from deadline import Deadline, DeadlineExceeded
+from http_archive import HttpArchive
+from models import (
+    InfluencerReport,
+    MentionAnalysis,
+    Profile,
+    ProfileAnalysis,
+    Recommendation,
+    SentimentEntry,
+    Tweet,
+)
+from rate_control import RateControlledSession
+from shared_cache import SharedCache
+
+# Upstream base URLs, overridable to point the scrapers at a stub server
+COINMARKETCAP_URL = os.environ.get('COINMARKETCAP_URL', 'https://coinmarketcap.com')
+TWITTER_URL = os.environ.get('TWITTER_URL', 'https://twitter.com')
+
+
+def create_session(archive=None, rate_limiter=None, delay=1.0, deadline=None):
+    """Create a rate-controlled requests session with browser-like headers.
+
+    Args:
+        archive (HttpArchive): Archive to record to or replay from. Defaults to
+            the archive configured through HTTP_ARCHIVE_* environment variables.
+        rate_limiter (RateLimiter): Per-host rate control, defaults to the
+            process-wide limiter
+        delay (float): Starting delay between requests to a host not yet contacted
+        deadline (Deadline): Optional time budget capping every request's timeout
+
+    Returns:
+        requests.Session: The configured session
+    """
+    session = RateControlledSession(rate_limiter, initial_delay=delay, deadline=deadline)
+
+    # Set a realistic user agent
+    session.headers.update({
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+        'Accept-Language': 'en-US,en;q=0.9',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1'
+    })
+
+    if archive is None:
+        archive = HttpArchive.from_env()
+    if archive is not None:
+        archive.mount(session)
+
+    return session
+
 
 class WebScraper:
     """Basic web scraper to extract content from websites."""
 
-    def __init__(self, delay=1.0):
+    def __init__(self, delay=1.0, archive=None, cache=None, rate_limiter=None):
         """Initialize the scraper.
 
         Args:
-            delay (float): Delay between requests in seconds
+            delay (float): Starting delay between requests in seconds; the rate
+                then adapts to how the host responds
+            archive (HttpArchive): Optional archive to record to or replay from
+            cache (SharedCache): Cache shared with other workers. Defaults to the
+                cache configured through SHARED_CACHE_* environment variables.
+            rate_limiter (RateLimiter): Per-host rate control, defaults to the
+                process-wide limiter
         """
-        self.session = requests.Session()
-        self.delay = delay
-
-        # Set a realistic user agent
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        })
+        self.session = create_session(archive, rate_limiter, delay)
+        self.cache = cache if cache is not None else SharedCache.from_env()
 
     def get_page(self, url):
         """Fetch a web page.
@@ -38,14 +86,22 @@ class WebScraper:
         Returns:
             BeautifulSoup: Parsed HTML or None if error
         """
-        try:
-            # Add a random delay to avoid detection
-            time.sleep(self.delay * (0.5 + random.random()))
+        if self.cache is not None:
+            html = self.cache.get_or_compute(f"page:{url}", lambda: self._fetch(url))
+        else:
+            html = self._fetch(url)
 
+        if html is None:
+            return None
+        return BeautifulSoup(html, 'html.parser')
+
+    def _fetch(self, url):
+        """Fetch the HTML of a web page, or None if error."""
+        try:
             response = self.session.get(url, timeout=15)
             response.raise_for_status()
 
-            return BeautifulSoup(response.text, 'html.parser')
+            return response.text
         except requests.exceptions.RequestException as e:
             print(f"Error fetching {url}: {str(e)}")
             return None
@@ -63,12 +119,49 @@ class CoinMarketCapScraper(WebScraper):
         Returns:
             dict: Dictionary of {symbol: {name, symbol, rank}}
         """
+        if self.cache is not None:
+            # An empty scrape is returned as None so it isn't cached
+            cryptocurrencies = self.cache.get_or_compute(
+                f"top-cryptos:{limit}", lambda: self._scrape_top_cryptocurrencies(limit) or None
+            ) or {}
+        else:
+            cryptocurrencies = self._scrape_top_cryptocurrencies(limit)
+
+        # If we couldn't extract cryptocurrencies, use a fallback list
+        if not cryptocurrencies:
+            print("Failed to extract cryptocurrencies from CoinMarketCap. Using fallback list.")
+            # Fallback list of top cryptocurrencies
+            fallback_cryptos = [
+                ('BTC', 'Bitcoin'), ('ETH', 'Ethereum'), ('USDT', 'Tether'), ('BNB', 'Binance Coin'),
+                ('SOL', 'Solana'), ('USDC', 'USD Coin'), ('XRP', 'XRP'), ('ADA', 'Cardano'),
+                ('AVAX', 'Avalanche'), ('DOGE', 'Dogecoin'), ('DOT', 'Polkadot'), ('MATIC', 'Polygon'),
+                ('LINK', 'Chainlink'), ('LTC', 'Litecoin'), ('SHIB', 'Shiba Inu'), ('UNI', 'Uniswap'),
+                ('TRX', 'TRON'), ('ATOM', 'Cosmos'), ('XMR', 'Monero'), ('ETC', 'Ethereum Classic'),
+                ('BCH', 'Bitcoin Cash'), ('VET', 'VeChain'), ('ALGO', 'Algorand'), ('FIL', 'Filecoin'),
+                ('XLM', 'Stellar'), ('MANA', 'Decentraland'), ('HBAR', 'Hedera'), ('SAND', 'The Sandbox'),
+                ('NEAR', 'NEAR Protocol'), ('AXS', 'Axie Infinity'), ('FTM', 'Fantom'), ('XTZ', 'Tezos'),
+                ('EGLD', 'MultiversX'), ('THETA', 'Theta Network'), ('EOS', 'EOS'), ('AAVE', 'Aave'),
+                ('ZEC', 'Zcash'), ('CAKE', 'PancakeSwap'), ('ONE', 'Harmony'), ('ENJ', 'Enjin Coin')
+            ]
+
+            for i, (symbol, name) in enumerate(fallback_cryptos):
+                cryptocurrencies[symbol] = {
+                    'name': name,
+                    'symbol': symbol,
+                    'rank': i + 1
+                }
+
+        print(f"Found {len(cryptocurrencies)} cryptocurrencies.")
+        return cryptocurrencies
+
+    def _scrape_top_cryptocurrencies(self, limit):
+        """Scrape top cryptocurrencies, returning an empty dict on failure."""
         # CoinMarketCap shows 100 coins per page
         pages = (limit + 99) // 100
         cryptocurrencies = {}
 
         for page in range(1, pages + 1):
-            url = f"https://coinmarketcap.com/?page={page}"
+            url = f"{COINMARKETCAP_URL}/?page={page}"
             print(f"Fetching cryptocurrencies from {url}...")
 
             soup = self.get_page(url)
@@ -129,31 +222,6 @@ class CoinMarketCapScraper(WebScraper):
             except Exception as e:
                 print(f"Error parsing CoinMarketCap page {page}: {e}")
 
-        # If we couldn't extract cryptocurrencies, use a fallback list
-        if not cryptocurrencies:
-            print("Failed to extract cryptocurrencies from CoinMarketCap. Using fallback list.")
-            # Fallback list of top cryptocurrencies
-            fallback_cryptos = [
-                ('BTC', 'Bitcoin'), ('ETH', 'Ethereum'), ('USDT', 'Tether'), ('BNB', 'Binance Coin'),
-                ('SOL', 'Solana'), ('USDC', 'USD Coin'), ('XRP', 'XRP'), ('ADA', 'Cardano'),
-                ('AVAX', 'Avalanche'), ('DOGE', 'Dogecoin'), ('DOT', 'Polkadot'), ('MATIC', 'Polygon'),
-                ('LINK', 'Chainlink'), ('LTC', 'Litecoin'), ('SHIB', 'Shiba Inu'), ('UNI', 'Uniswap'),
-                ('TRX', 'TRON'), ('ATOM', 'Cosmos'), ('XMR', 'Monero'), ('ETC', 'Ethereum Classic'),
-                ('BCH', 'Bitcoin Cash'), ('VET', 'VeChain'), ('ALGO', 'Algorand'), ('FIL', 'Filecoin'),
-                ('XLM', 'Stellar'), ('MANA', 'Decentraland'), ('HBAR', 'Hedera'), ('SAND', 'The Sandbox'),
-                ('NEAR', 'NEAR Protocol'), ('AXS', 'Axie Infinity'), ('FTM', 'Fantom'), ('XTZ', 'Tezos'),
-                ('EGLD', 'MultiversX'), ('THETA', 'Theta Network'), ('EOS', 'EOS'), ('AAVE', 'Aave'),
-                ('ZEC', 'Zcash'), ('CAKE', 'PancakeSwap'), ('ONE', 'Harmony'), ('ENJ', 'Enjin Coin')
-            ]
-
-            for i, (symbol, name) in enumerate(fallback_cryptos):
-                cryptocurrencies[symbol] = {
-                    'name': name,
-                    'symbol': symbol,
-                    'rank': i + 1
-                }
-
-        print(f"Found {len(cryptocurrencies)} cryptocurrencies.")
         return cryptocurrencies
 
 
@@ -234,24 +302,24 @@ class CryptoInfluencerScraper(WebScraper):
 class CryptoTwitterAnalyser:
     """Agent that analyses crypto influencer Twitter profiles."""
 
-    def __init__(self, crypto_data=None, delay=2.0):
+    def __init__(self, crypto_data=None, delay=2.0, archive=None, cache=None, rate_limiter=None,
+                 deadline=None):
         """Initialize the analyser.
 
         Args:
             crypto_data (dict): Dictionary of cryptocurrency data
-            delay (float): Delay between requests in seconds
+            delay (float): Starting delay between requests in seconds; the rate
+                then adapts to how the host responds
+            archive (HttpArchive): Optional archive to record to or replay from
+            cache (SharedCache): Cache shared with other workers. Defaults to the
+                cache configured through SHARED_CACHE_* environment variables.
+            rate_limiter (RateLimiter): Per-host rate control, defaults to the
+                process-wide limiter
+            deadline (Deadline): Optional time budget for all of this analyser's requests
         """
-        self.session = requests.Session()
-        self.delay = delay
-
-        # Set a realistic user agent
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        })
+        self.session = create_session(archive, rate_limiter, delay, deadline)
+        self.deadline = deadline
+        self.cache = cache if cache is not None else SharedCache.from_env()
 
         # Use provided crypto data or default keywords
         if crypto_data:
@@ -316,6 +384,10 @@ class CryptoTwitterAnalyser:
                               'overvalued', 'avoid', 'risk', 'bubble', 'resistance', 'concern',
                               'bearish', 'downtrend', 'downside', 'loss', 'losing', 'underperform']
 
+        # Cached analyses are only valid for the same set of keywords
+        keywords = json.dumps(sorted(self.crypto_keywords.items()))
+        self._keywords_digest = hashlib.sha256(keywords.encode('utf-8')).hexdigest()[:16]
+
     def analyse_twitter_profile(self, username):
         """
         Analyse a Twitter profile for cryptocurrency mentions.
@@ -327,157 +399,170 @@ class CryptoTwitterAnalyser:
         Returns:
             dict: Analysis results
         """
-        # Add a random delay to avoid detection
-        time.sleep(self.delay * (0.5 + random.random()))
+        return self.analyse_profile(username).to_dict()
+
+    def analyse_profile(self, username):
+        """
+        Analyse a Twitter profile for cryptocurrency mentions.
+
+        Args:
+            username (str): Twitter username without the @ symbol
 
+        Returns:
+            ProfileAnalysis: Analysis results, with `error` set if all methods failed
+
+        Raises:
+            DeadlineExceeded: If the analyser's deadline stopped a request
+        """
+        if self.cache is None:
+            return self._analyse_profile(username)
+
+        # Failed analyses are not cached, but still need returning to the caller
+        failures = []
+
+        def compute():
+            result = self._analyse_profile(username)
+            if result.error:
+                failures.append(result)
+                return None
+            return result.to_dict()
+
+        data = self.cache.get_or_compute(
+            f"analysis:{self._keywords_digest}:{username}",
+            compute,
+            timeout=self.deadline.remaining() if self.deadline is not None else None
+        )
+        if data is None:
+            return failures[-1]
+        return ProfileAnalysis.from_dict(data)
+
+    def _analyse_profile(self, username):
+        """Scrape and analyse a profile, bypassing the cache."""
         # Try multiple methods in sequence
         result = self._try_scrape_twitter_by_html(username)
 
         # If that failed, try alternatives
-        if 'error' in result:
+        if result.error:
             # Try official search page as a last resort
             result = self._try_scrape_official_twitter(username)
 
         # If all methods failed, return basic profile with error
-        if 'error' in result:
-            return {
-                'profile': {'username': username, 'name': username, 'bio': "Could not retrieve bio"},
-                'analysis': {
-                    'total_crypto_mentions': 0,
-                    'mentioned_cryptocurrencies': {},
-                    'sentiment_analysis': {},
-                    'potential_recommendations': []
-                },
-                'tweet_count': 0,
-                'tweets_analysed': [],
-                'error': result['error']
-            }
+        if result.error:
+            return ProfileAnalysis.failed(username, result.error)
 
         return result
 
+    def _extract_tweets(self, soup):
+        """Extract up to 20 tweets from a Twitter page."""
+        tweets = []
+        tweet_elements = soup.select('article[data-testid="tweet"]')
+
+        for tweet_element in tweet_elements[:20]:  # Limit to recent tweets
+            tweet_text_element = tweet_element.select_one('div[data-testid="tweetText"]')
+            if not tweet_text_element:
+                continue
+
+            # Twitter dates are complex to extract from HTML, so we'll skip for now
+            tweets.append(Tweet(text=tweet_text_element.get_text(strip=True)))
+
+        return tweets
+
     def _try_scrape_twitter_by_html(self, username):
         """Try to scrape Twitter directly."""
         try:
-            url = f"https://twitter.com/{username}"
+            url = f"{TWITTER_URL}/{username}"
             response = self.session.get(url, timeout=15)
             response.raise_for_status()
 
             soup = BeautifulSoup(response.text, 'html.parser')
 
-            # Extract profile info
-            profile_info = {'username': username}
-
             # Twitter's structure is complex and changes often
             # This is a simplified approach that might need updates
 
             # Extract username from title
             title = soup.find('title')
             if title and '(' in title.text:
-                profile_info['name'] = title.text.split('(')[0].strip()
+                name = title.text.split('(')[0].strip()
             else:
-                profile_info['name'] = username
+                name = username
 
             # Try to find bio
             bio_selector = soup.select('div[data-testid="UserDescription"]')
-            profile_info['bio'] = bio_selector[0].text if bio_selector else "No bio available"
-
-            # Extract tweets - this is challenging due to Twitter's dynamic loading
-            tweets = []
-            tweet_elements = soup.select('article[data-testid="tweet"]')
-
-            for i, tweet_element in enumerate(tweet_elements[:20]):  # Limit to recent tweets
-                tweet_text_element = tweet_element.select_one('div[data-testid="tweetText"]')
-                if not tweet_text_element:
-                    continue
+            bio = bio_selector[0].text if bio_selector else "No bio available"
 
-                tweet_text = tweet_text_element.get_text(strip=True)
+            profile = Profile(username=username, name=name, bio=bio)
 
-                # Twitter dates are complex to extract from HTML, so we'll skip for now
-                tweets.append({
-                    'text': tweet_text,
-                    'date': ''  # Empty date
-                })
-
-                if i >= 20:  # Limit to 20 tweets
-                    break
+            # Extract tweets - this is challenging due to Twitter's dynamic loading
+            tweets = self._extract_tweets(soup)
 
             # If we couldn't get tweets, try to at least analyse the bio
             if not tweets:
-                tweets = [{'text': profile_info['bio'], 'date': ''}]
+                tweets = [Tweet(text=bio)]
 
             # Analyse cryptocurrency mentions
-            analysis = self.analyse_crypto_mentions(tweets, profile_info['bio'])
+            analysis = self.analyse_mentions(tweets, bio)
 
-            return {
-                'profile': profile_info,
-                'analysis': analysis,
-                'tweet_count': len(tweets),
-                'tweets_analysed': tweets
-            }
+            return ProfileAnalysis(profile=profile, analysis=analysis, tweets=tweets)
 
+        except DeadlineExceeded:
+            # Running out of time isn't a failure of this method; let the caller skip the profile
+            raise
         except Exception as e:
-            return {
-                'username': username,
-                'error': f"Error with direct Twitter scraping: {str(e)}",
-                'status': getattr(e, 'response', {}).get('status_code', None) if hasattr(e, 'response') else None
-            }
+            return ProfileAnalysis.failed(username, f"Error with direct Twitter scraping: {str(e)}")
 
     def _try_scrape_official_twitter(self, username):
         """Try to scrape from official Twitter search page."""
         try:
             # Try Twitter search URL which sometimes has fewer restrictions
-            search_url = f"https://twitter.com/search?q=from%3A{username}&f=live"
+            search_url = f"{TWITTER_URL}/search?q=from%3A{username}&f=live"
             response = self.session.get(search_url, timeout=15)
             response.raise_for_status()
 
             soup = BeautifulSoup(response.text, 'html.parser')
 
             # Extract profile info - more basic info from search page
-            profile_info = {'username': username, 'name': username, 'bio': "Bio not available from search page"}
+            profile = Profile(username=username, name=username, bio="Bio not available from search page")
 
             # Extract tweets from search results
-            tweets = []
-            tweet_elements = soup.select('article[data-testid="tweet"]')
-
-            for i, tweet_element in enumerate(tweet_elements[:20]):
-                tweet_text_element = tweet_element.select_one('div[data-testid="tweetText"]')
-                if not tweet_text_element:
-                    continue
-
-                tweet_text = tweet_text_element.get_text(strip=True)
-
-                tweets.append({
-                    'text': tweet_text,
-                    'date': ''  # Date not easily available
-                })
-
-                if i >= 20:  # Limit to 20 tweets
-                    break
+            tweets = self._extract_tweets(soup)
 
             # Analyse cryptocurrency mentions
-            analysis = self.analyse_crypto_mentions(tweets, "")  # No bio from search page
+            analysis = self.analyse_mentions(tweets, "")  # No bio from search page
 
-            return {
-                'profile': profile_info,
-                'analysis': analysis,
-                'tweet_count': len(tweets),
-                'tweets_analysed': tweets
-            }
+            return ProfileAnalysis(profile=profile, analysis=analysis, tweets=tweets)
 
+        except DeadlineExceeded:
+            # Running out of time isn't a failure of this method; let the caller skip the profile
+            raise
         except Exception as e:
-            return {
-                'username': username,
-                'error': f"Error with Twitter search scraping: {str(e)}",
-                'status': getattr(e, 'response', {}).get('status_code', None) if hasattr(e, 'response') else None
-            }
+            return ProfileAnalysis.failed(username, f"Error with Twitter search scraping: {str(e)}")
 
     def analyse_crypto_mentions(self, tweets, bio):
         """
         Analyse tweets and bio for cryptocurrency mentions.
-        (This method remains unchanged from your original code)
+
+        Args:
+            tweets (list): List of tweet dictionaries with a 'text' key
+            bio (str): Profile bio
+
+        Returns:
+            dict: Analysis results in the API's JSON shape
+        """
+        return self.analyse_mentions([Tweet.from_dict(t) for t in tweets], bio).to_dict()
+
+    def analyse_mentions(self, tweets, bio):
+        """
+        Analyse tweets and bio for cryptocurrency mentions.
+
+        Args:
+            tweets (list): List of Tweet objects
+            bio (str): Profile bio
+
+        Returns:
+            MentionAnalysis: Mentions, sentiment and top 5 recommendations
         """
         # Combine all text for analysis
-        all_text = bio + ' ' + ' '.join([t['text'] for t in tweets])
+        all_text = bio + ' ' + ' '.join([t.text for t in tweets])
         all_text = all_text.lower()
 
         # Count cryptocurrency mentions
@@ -498,7 +583,7 @@ class CryptoTwitterAnalyser:
 
             # Look for sentiment words near cryptocurrency mentions
             for tweet in tweets:
-                tweet_lower = tweet['text'].lower()
+                tweet_lower = tweet.text.lower()
 
                 if any(keyword.lower() in tweet_lower for keyword, symbol in self.crypto_keywords.items() if
                        symbol == crypto):
@@ -512,35 +597,35 @@ class CryptoTwitterAnalyser:
             elif bearish_score > bullish_score * 1.5:
                 sentiment = "bearish"
 
-            sentiment_analysis[crypto] = {
-                'mentions': count,
-                'sentiment': sentiment,
-                'bullish_score': bullish_score,
-                'bearish_score': bearish_score
-            }
+            sentiment_analysis[crypto] = SentimentEntry(
+                mentions=count,
+                sentiment=sentiment,
+                bullish_score=bullish_score,
+                bearish_score=bearish_score
+            )
 
         # Find potential recommendations
         recommendations = []
-        for crypto, data in sentiment_analysis.items():
-            if data['sentiment'] == 'bullish' and data['mentions'] >= 2:
-                recommendations.append({
-                    'symbol': crypto,
-                    'strength': min(10, data['bullish_score'] * data['mentions'] // 2),
-                    'sentiment': data['sentiment']
-                })
+        for crypto, entry in sentiment_analysis.items():
+            if entry.sentiment == 'bullish' and entry.mentions >= 2:
+                recommendations.append(Recommendation(
+                    symbol=crypto,
+                    strength=min(10, entry.bullish_score * entry.mentions // 2),
+                    sentiment=entry.sentiment
+                ))
 
         # Sort recommendations by strength
-        recommendations.sort(key=lambda x: x['strength'], reverse=True)
+        recommendations.sort(key=lambda x: x.strength, reverse=True)
 
-        return {
-            'total_crypto_mentions': sum(crypto_mentions.values()),
-            'mentioned_cryptocurrencies': dict(crypto_mentions),
-            'sentiment_analysis': sentiment_analysis,
-            'potential_recommendations': recommendations[:5]  # Top 5 recommendations
-        }
+        return MentionAnalysis(
+            mentioned_cryptocurrencies=dict(crypto_mentions),
+            sentiment_analysis=sentiment_analysis,
+            potential_recommendations=recommendations[:5]  # Top 5 recommendations
+        )
 
 
-def analyse_multiple_influencers(usernames, crypto_data=None, delay=2.0):
+def analyse_multiple_influencers(usernames, crypto_data=None, delay=2.0, archive=None, cache=None,
+                                 deadline=None):
     """
     Analyse multiple Twitter profiles and aggregate results.
 
@@ -548,64 +633,61 @@ def analyse_multiple_influencers(usernames, crypto_data=None, delay=2.0):
         usernames (list): List of Twitter usernames
         crypto_data (dict): Dictionary of cryptocurrency data
         delay (float): Delay between requests
+        archive (HttpArchive): Optional archive to record to or replay from
+        cache (SharedCache): Optional cache shared with other workers
+        deadline (float): Optional time budget in seconds for the whole call
 
     Returns:
-        dict: Aggregated analysis
+        dict: Aggregated analysis, with `partial` set if any username was skipped
     """
-    analyser = CryptoTwitterAnalyser(crypto_data=crypto_data, delay=delay)
+    return analyse_influencers(usernames, crypto_data=crypto_data, delay=delay, archive=archive,
+                               cache=cache, deadline=deadline).to_dict()
 
-    # Collect individual analyses
-    individual_analyses = []
-    aggregated_mentions = Counter()
-    all_recommendations = []
 
-    for username in usernames:
-        print(f"Analysing @{username}...")
-        result = analyser.analyse_twitter_profile(username)
+def analyse_influencers(usernames, crypto_data=None, delay=2.0, archive=None, cache=None, deadline=None):
+    """
+    Analyse multiple Twitter profiles and aggregate results.
 
-        if 'error' in result:
-            print(f"Error analysing @{username}: {result['error']}")
-            continue
+    Args:
+        usernames (list): List of Twitter usernames
+        crypto_data (dict): Dictionary of cryptocurrency data
+        delay (float): Delay between requests
+        archive (HttpArchive): Optional archive to record to or replay from
+        cache (SharedCache): Optional cache shared with other workers
+        deadline (float): Optional time budget in seconds for the whole call. Every
+            request's timeout is capped at the time left, and usernames not
+            analysed when it runs out are listed in `skipped`.
 
-        individual_analyses.append(result)
+    Returns:
+        InfluencerReport: Aggregated analysis holding the typed profile results
+    """
+    budget = Deadline(deadline) if deadline is not None else None
+    analyser = CryptoTwitterAnalyser(crypto_data=crypto_data, delay=delay, archive=archive, cache=cache,
+                                     deadline=budget)
+    report = InfluencerReport()
 
-        # Update aggregated mentions
-        for crypto, count in result['analysis']['mentioned_cryptocurrencies'].items():
-            aggregated_mentions[crypto] += count
+    for username in usernames:
+        if budget is not None and budget.expired():
+            report.skipped.append(username)
+            continue
 
-        # Collect recommendations
-        for rec in result['analysis']['potential_recommendations']:
-            all_recommendations.append({
-                'from': username,
-                'symbol': rec['symbol'],
-                'strength': rec['strength'],
-                'sentiment': rec['sentiment']
-            })
+        print(f"Analysing @{username}...")
+        try:
+            result = analyser.analyse_profile(username)
+        except DeadlineExceeded as e:
+            print(f"Deadline reached while analysing @{username}: {e}")
+            report.skipped.append(username)
+            continue
 
-    # Aggregate recommendations
-    crypto_scores = Counter()
-    crypto_mentions_by_influencers = Counter()
-
-    for rec in all_recommendations:
-        crypto_scores[rec['symbol']] += rec['strength']
-        crypto_mentions_by_influencers[rec['symbol']] += 1
-
-    # Create final recommendations list
-    final_recommendations = []
-    for crypto, score in crypto_scores.most_common():
-        if crypto_mentions_by_influencers[crypto] > 1:  # At least 2 influencers recommend
-            final_recommendations.append({
-                'symbol': crypto,
-                'aggregate_score': score,
-                'influencer_count': crypto_mentions_by_influencers[crypto],
-                'average_strength': score / crypto_mentions_by_influencers[crypto]
-            })
+        if result.error:
+            # A request timeout capped by the deadline surfaces as an ordinary error
+            if budget is not None and budget.expired():
+                print(f"Deadline reached while analysing @{username}")
+                report.skipped.append(username)
+            else:
+                print(f"Error analysing @{username}: {result.error}")
+            continue
+
+        report.add(result)
 
-    return {
-        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-        'influencers_analysed': len(individual_analyses),
-        'total_crypto_mentions': sum(aggregated_mentions.values()),
-        'mentions_by_crypto': dict(aggregated_mentions.most_common()),
-        'top_recommendations': final_recommendations[:5],  # Top 5 recommendations
-        'individual_analyses': individual_analyses
-    }
+    return report
@@ -0,0 +1,42 @@
+import time
+
+import requests
+
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """Raised when a request cannot be sent before its deadline."""
+
+
+class Deadline:
+    """Time budget shared by all the requests made for one API call."""
+
+    def __init__(self, seconds):
+        """Initialize the deadline.
+
+        Args:
+            seconds (float): Budget in seconds from now
+        """
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self):
+        """Seconds left before the deadline, never negative."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        return self.remaining() == 0
+
+    def timeout(self, timeout=None):
+        """Cap a request timeout at the time remaining.
+
+        Args:
+            timeout: A requests timeout - seconds, a (connect, read) tuple or None
+
+        Returns:
+            The capped timeout, in the same form
+        """
+        remaining = self.remaining()
+        if remaining == 0:
+            raise DeadlineExceeded("Deadline reached")
+        if isinstance(timeout, tuple):
+            return tuple(remaining if t is None else min(t, remaining) for t in timeout)
+        return remaining if timeout is None else min(timeout, remaining)
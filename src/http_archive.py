@@ -0,0 +1,186 @@
+import base64
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+from datetime import timedelta
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+RECORD = 'record'
+REPLAY = 'replay'
+
+# The archived body is stored already decoded, so these no longer describe it
+_DROPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding'}
+
+
+class HttpArchive:
+    """Archive of HTTP responses for deterministic offline runs.
+
+    In record mode every response fetched through a mounted session is written
+    to `path` as a gzip-compressed JSON file. In replay mode responses are served
+    from those files and nothing touches the network; URLs missing from the
+    archive fail with a ConnectionError, just like an unreachable host.
+    """
+
+    def __init__(self, path, mode=REPLAY, latency=0.0, use_recorded_latency=False, replace_with_failures=False):
+        """Initialize the archive.
+
+        Args:
+            path (str): Directory holding the archived responses
+            mode (str): 'record' or 'replay'
+            latency (float): Extra delay in seconds added to each replayed response
+            use_recorded_latency (bool): Also wait as long as the original request took
+            replace_with_failures (bool): Let a 429 or 5xx response overwrite an
+                earlier successful recording of the same URL
+        """
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown HTTP archive mode: {mode}")
+
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.use_recorded_latency = use_recorded_latency
+        self.replace_with_failures = replace_with_failures
+
+        os.makedirs(path, exist_ok=True)
+
+    @classmethod
+    def from_env(cls):
+        """Create an archive from environment variables.
+
+        HTTP_ARCHIVE_PATH enables the archive; HTTP_ARCHIVE_MODE ('record' or
+        'replay', default 'replay'), HTTP_ARCHIVE_LATENCY (seconds, or
+        'recorded') and HTTP_ARCHIVE_REPLACE_FAILURES ('1' to let failures
+        overwrite good recordings) configure it.
+
+        Returns:
+            HttpArchive: The configured archive, or None if not enabled
+        """
+        path = os.environ.get('HTTP_ARCHIVE_PATH')
+        if not path:
+            return None
+
+        mode = os.environ.get('HTTP_ARCHIVE_MODE', REPLAY)
+        replace_with_failures = os.environ.get('HTTP_ARCHIVE_REPLACE_FAILURES') == '1'
+        latency = os.environ.get('HTTP_ARCHIVE_LATENCY', '0')
+        if latency == 'recorded':
+            return cls(path, mode=mode, use_recorded_latency=True, replace_with_failures=replace_with_failures)
+        return cls(path, mode=mode, latency=float(latency), replace_with_failures=replace_with_failures)
+
+    def mount(self, session):
+        """Route all of a session's HTTP(S) traffic through this archive."""
+        adapter = ArchiveAdapter(self)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def _entry_path(self, method, url):
+        key = hashlib.sha256(f"{method} {url}".encode('utf-8')).hexdigest()
+        return os.path.join(self.path, f"{key}.json.gz")
+
+    def save(self, response):
+        """Write a response to the archive, replacing any earlier recording.
+
+        A throttled or failed response (429 or 5xx) doesn't replace an earlier
+        successful recording unless `replace_with_failures` is set, so one bad
+        re-recording run can't spoil a good archive.
+
+        Returns:
+            bool: Whether the response was written
+        """
+        method, url = response.request.method, response.request.url
+        if not self.replace_with_failures and (response.status_code == 429 or response.status_code >= 500):
+            existing = self.load(method, url)
+            if existing is not None and 200 <= existing['status'] < 300:
+                print(f"Keeping archived {method} {url} instead of the {response.status_code} response")
+                return False
+
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS}
+        entry = {
+            'method': method,
+            'url': url,
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': headers,
+            'body': base64.b64encode(response.content).decode('ascii'),
+            'elapsed': response.elapsed.total_seconds(),
+            'recorded_at': time.time()
+        }
+
+        entry_path = self._entry_path(method, url)
+
+        # Write atomically so concurrent recorders never leave a torn file
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        try:
+            with gzip.open(os.fdopen(fd, 'wb'), 'wt', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, entry_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return True
+
+    def load(self, method, url):
+        """Read an archived response.
+
+        Returns:
+            dict: The archived entry, or None if the URL was never recorded
+        """
+        try:
+            with gzip.open(self._entry_path(method, url), 'rt', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def replay(self, request):
+        """Build a Response for a request from the archive."""
+        entry = self.load(request.method, request.url)
+        if entry is None:
+            raise requests.exceptions.ConnectionError(
+                f"No archived response for {request.method} {request.url}", request=request
+            )
+
+        delay = self.latency
+        if self.use_recorded_latency:
+            delay += entry['elapsed']
+        if delay > 0:
+            time.sleep(delay)
+
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.reason = entry['reason']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = base64.b64decode(entry['body'])
+        response._content_consumed = True
+        response.url = request.url
+        response.request = request
+        response.elapsed = timedelta(seconds=entry['elapsed'])
+        return response
+
+
+class ArchiveAdapter(HTTPAdapter):
+    """Transport adapter that records to or replays from an HttpArchive."""
+
+    def __init__(self, archive, **kwargs):
+        super().__init__(**kwargs)
+        self.archive = archive
+
+    @property
+    def replaying(self):
+        """Whether responses come from the archive instead of the network."""
+        return self.archive.mode == REPLAY
+
+    def send(self, request, **kwargs):
+        if self.replaying:
+            return self.archive.replay(request)
+
+        response = super().send(request, **kwargs)
+        self.archive.save(response)
+        return response
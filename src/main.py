@@ -4,8 +4,9 @@ from crypto_influencer_analyser import (
     CoinMarketCapScraper,
     CryptoInfluencerScraper,
     CryptoTwitterAnalyser,
-    analyse_multiple_influencers,
+    analyse_influencers,
 )
+from rate_control import default_rate_limiter
 
 app = FastAPI(
     title="Crypto Influencer Analyser API",
@@ -35,5 +36,16 @@ def analyse_influencer(username: str):
 
 
 @app.post("/analyse-multiple")
-def analyse_multiple(usernames: List[str] = Query(...), delay: Optional[float] = 2.0):
-    return analyse_multiple_influencers(usernames, delay=delay)
+def analyse_multiple(
+    usernames: List[str] = Query(...),
+    delay: Optional[float] = 2.0,
+    deadline: Optional[float] = Query(None, gt=0, description="Time budget in seconds for the whole call")
+):
+    # Profiles stay in their compact typed form until the response is built
+    return analyse_influencers(usernames, delay=delay, deadline=deadline).to_dict()
+
+
+@app.get("/metrics")
+def get_metrics():
+    # Per-process: each uvicorn worker reports its own rate controllers
+    return {"rate_control": default_rate_limiter.snapshot()}
@@ -0,0 +1,297 @@
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from sys import intern
+
+
+@dataclass(slots=True)
+class Tweet:
+    """A single scraped tweet."""
+
+    text: str
+    date: str = ''
+
+    def to_dict(self):
+        return {'text': self.text, 'date': self.date}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(text=data['text'], date=data.get('date', ''))
+
+
+@dataclass(slots=True)
+class Profile:
+    """Basic information about a Twitter profile."""
+
+    username: str
+    name: str
+    bio: str
+
+    def to_dict(self):
+        return {'username': self.username, 'name': self.name, 'bio': self.bio}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            username=data['username'],
+            name=data.get('name', data['username']),
+            bio=data.get('bio', '')
+        )
+
+
+@dataclass(slots=True)
+class SentimentEntry:
+    """Sentiment scores for one cryptocurrency within a profile."""
+
+    mentions: int
+    sentiment: str
+    bullish_score: int
+    bearish_score: int
+
+    def to_dict(self):
+        return {
+            'mentions': self.mentions,
+            'sentiment': self.sentiment,
+            'bullish_score': self.bullish_score,
+            'bearish_score': self.bearish_score
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            mentions=data['mentions'],
+            sentiment=intern(data['sentiment']),
+            bullish_score=data['bullish_score'],
+            bearish_score=data['bearish_score']
+        )
+
+
+@dataclass(slots=True)
+class Recommendation:
+    """A cryptocurrency recommended by a single profile."""
+
+    symbol: str
+    strength: int
+    sentiment: str
+
+    def to_dict(self):
+        return {'symbol': self.symbol, 'strength': self.strength, 'sentiment': self.sentiment}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            symbol=intern(data['symbol']),
+            strength=data['strength'],
+            sentiment=intern(data['sentiment'])
+        )
+
+
+@dataclass(slots=True)
+class MentionAnalysis:
+    """Cryptocurrency mentions, sentiment and recommendations for a profile."""
+
+    mentioned_cryptocurrencies: dict = field(default_factory=dict)
+    sentiment_analysis: dict = field(default_factory=dict)
+    potential_recommendations: list = field(default_factory=list)
+
+    @property
+    def total_crypto_mentions(self):
+        return sum(self.mentioned_cryptocurrencies.values())
+
+    def to_dict(self):
+        return {
+            'total_crypto_mentions': self.total_crypto_mentions,
+            'mentioned_cryptocurrencies': dict(self.mentioned_cryptocurrencies),
+            'sentiment_analysis': {
+                symbol: entry.to_dict() for symbol, entry in self.sentiment_analysis.items()
+            },
+            'potential_recommendations': [rec.to_dict() for rec in self.potential_recommendations]
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            mentioned_cryptocurrencies={
+                intern(symbol): count for symbol, count in data['mentioned_cryptocurrencies'].items()
+            },
+            sentiment_analysis={
+                intern(symbol): SentimentEntry.from_dict(entry)
+                for symbol, entry in data['sentiment_analysis'].items()
+            },
+            potential_recommendations=[
+                Recommendation.from_dict(rec) for rec in data['potential_recommendations']
+            ]
+        )
+
+
+@dataclass(slots=True)
+class ProfileAnalysis:
+    """Analysis results for a single Twitter profile."""
+
+    profile: Profile
+    analysis: MentionAnalysis
+    tweets: list = field(default_factory=list)
+    error: str = None
+
+    @classmethod
+    def failed(cls, username, error, bio="Could not retrieve bio"):
+        """Build an empty result for a profile that could not be analysed."""
+        return cls(
+            profile=Profile(username=username, name=username, bio=bio),
+            analysis=MentionAnalysis(),
+            error=error
+        )
+
+    def to_dict(self):
+        """Convert to the JSON shape returned by the API."""
+        result = {
+            'profile': self.profile.to_dict(),
+            'analysis': self.analysis.to_dict(),
+            'tweet_count': len(self.tweets),
+            'tweets_analysed': [tweet.to_dict() for tweet in self.tweets]
+        }
+        if self.error is not None:
+            result['error'] = self.error
+        return result
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            profile=Profile.from_dict(data['profile']),
+            analysis=MentionAnalysis.from_dict(data['analysis']),
+            tweets=[Tweet.from_dict(tweet) for tweet in data.get('tweets_analysed', [])],
+            error=data.get('error')
+        )
+
+
+class AnalysisBatch:
+    """Columnar aggregate of many profile analyses.
+
+    Cryptocurrency symbols are interned to small integer ids and the mention
+    counts and recommendations are stored in flat arrays, so aggregating over
+    thousands of profiles does not keep a dict per profile alive.
+    """
+
+    __slots__ = ('symbols', '_symbol_ids', 'count', 'mention_symbols', 'mention_counts',
+                 'rec_symbols', 'rec_strengths')
+
+    def __init__(self):
+        self.symbols = []
+        self._symbol_ids = {}
+        self.count = 0
+
+        self.mention_symbols = array('I')
+        self.mention_counts = array('I')
+
+        self.rec_symbols = array('I')
+        self.rec_strengths = array('i')
+
+    def __len__(self):
+        return self.count
+
+    def symbol_id(self, symbol):
+        """Return the interned id for a symbol, assigning one if needed."""
+        symbol_id = self._symbol_ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = len(self.symbols)
+            self.symbols.append(intern(symbol))
+            self._symbol_ids[symbol] = symbol_id
+        return symbol_id
+
+    def add(self, result):
+        """Add a ProfileAnalysis to the batch.
+
+        Args:
+            result (ProfileAnalysis): A successful profile analysis
+        """
+        self.count += 1
+
+        for symbol, count in result.analysis.mentioned_cryptocurrencies.items():
+            self.mention_symbols.append(self.symbol_id(symbol))
+            self.mention_counts.append(count)
+
+        for rec in result.analysis.potential_recommendations:
+            self.rec_symbols.append(self.symbol_id(rec.symbol))
+            self.rec_strengths.append(rec.strength)
+
+    def mention_totals(self):
+        """Total mentions per symbol across all profiles.
+
+        Returns:
+            Counter: {symbol: mentions}, in order of first appearance
+        """
+        totals = Counter()
+        for symbol_id, count in zip(self.mention_symbols, self.mention_counts):
+            totals[self.symbols[symbol_id]] += count
+        return totals
+
+    def recommendation_totals(self):
+        """Aggregate recommendation strength per symbol across all profiles.
+
+        Returns:
+            tuple: (Counter of {symbol: total strength},
+                    Counter of {symbol: number of recommending profiles})
+        """
+        scores = Counter()
+        influencer_counts = Counter()
+        for symbol_id, strength in zip(self.rec_symbols, self.rec_strengths):
+            symbol = self.symbols[symbol_id]
+            scores[symbol] += strength
+            influencer_counts[symbol] += 1
+        return scores, influencer_counts
+
+
+@dataclass(slots=True)
+class InfluencerReport:
+    """Aggregated analysis of several Twitter profiles.
+
+    Profiles are kept as ProfileAnalysis objects and only converted to the
+    API's JSON shape by `to_dict`, so a long batch holds the compact form.
+    """
+
+    batch: AnalysisBatch = field(default_factory=AnalysisBatch)
+    analyses: list = field(default_factory=list)
+    skipped: list = field(default_factory=list)
+    timestamp: str = field(default_factory=lambda: datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+
+    def add(self, result):
+        """Add a successful ProfileAnalysis to the report."""
+        self.batch.add(result)
+        self.analyses.append(result)
+
+    def top_recommendations(self, limit=5):
+        """Cryptocurrencies recommended by at least two profiles, strongest first.
+
+        Args:
+            limit (int): Maximum number of recommendations
+
+        Returns:
+            list: Recommendation dictionaries in the API's JSON shape
+        """
+        crypto_scores, crypto_mentions_by_influencers = self.batch.recommendation_totals()
+
+        recommendations = []
+        for crypto, score in crypto_scores.most_common():
+            if crypto_mentions_by_influencers[crypto] > 1:  # At least 2 influencers recommend
+                recommendations.append({
+                    'symbol': crypto,
+                    'aggregate_score': score,
+                    'influencer_count': crypto_mentions_by_influencers[crypto],
+                    'average_strength': score / crypto_mentions_by_influencers[crypto]
+                })
+        return recommendations[:limit]
+
+    def to_dict(self):
+        """Convert to the JSON shape returned by the API."""
+        aggregated_mentions = self.batch.mention_totals()
+        return {
+            'timestamp': self.timestamp,
+            'influencers_analysed': len(self.batch),
+            'total_crypto_mentions': sum(aggregated_mentions.values()),
+            'mentions_by_crypto': dict(aggregated_mentions.most_common()),
+            'top_recommendations': self.top_recommendations(),
+            'individual_analyses': [result.to_dict() for result in self.analyses],
+            'partial': bool(self.skipped),
+            'skipped': list(self.skipped)
+        }
@@ -0,0 +1,323 @@
+import os
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+import urllib3
+
+from deadline import DeadlineExceeded
+
+
+def parse_retry_after(value):
+    """Parse a Retry-After header into seconds.
+
+    Args:
+        value (str): Either a number of seconds or an HTTP date
+
+    Returns:
+        float: Seconds to wait, or None if missing or malformed
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class HostRateController:
+    """AIMD rate controller for requests to a single host.
+
+    The request rate grows additively while responses are healthy and shrinks
+    multiplicatively on 429s, 5xx responses, timeouts and when latency climbs
+    well above the best recent latency. A Retry-After header pauses all
+    requests to the host until it has passed.
+    """
+
+    def __init__(self, initial_rate=1.0, min_rate=0.1, max_rate=10.0, increase=0.1,
+                 decrease=0.5, latency_tolerance=3.0, latency_decrease=0.8, jitter=0.5,
+                 latency_window=20):
+        """Initialize the controller.
+
+        Args:
+            initial_rate (float): Starting rate in requests per second
+            min_rate (float): Lowest rate backoff can reach
+            max_rate (float): Highest rate ramp-up can reach
+            increase (float): Requests per second added after each healthy response
+            decrease (float): Factor applied to the rate on throttling or errors
+            latency_tolerance (float): Back off when the average latency exceeds
+                this multiple of the lowest recent latency
+            latency_decrease (float): Factor applied to the rate on latency growth
+            jitter (float): Spacing between requests varies by up to this fraction
+            latency_window (int): Number of recent 2xx responses the lowest
+                latency is taken from, so one fast outlier is soon forgotten
+        """
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.rate = min(max(initial_rate, min_rate), max_rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.latency_decrease = latency_decrease
+        self.jitter = jitter
+
+        self.next_slot = 0.0
+        self.blocked_until = 0.0
+        self.avg_latency = None
+        self.recent_latencies = deque(maxlen=latency_window)
+        self.requests = 0
+        self.throttled = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait=None):
+        """Reserve the next send slot.
+
+        Args:
+            max_wait (float): Don't reserve a slot further away than this
+
+        Returns:
+            float: Seconds to wait before sending, or None if over max_wait
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot, self.blocked_until)
+            if max_wait is not None and slot - now > max_wait:
+                return None
+            spacing = (1.0 / self.rate) * (1 + self.jitter * (2 * random.random() - 1))
+            self.next_slot = slot + spacing
+            return slot - now
+
+    def acquire(self, max_wait=None):
+        """Block until the next request to this host may be sent.
+
+        Args:
+            max_wait (float): Give up instead of waiting longer than this
+
+        Returns:
+            bool: False if the request may not be sent within max_wait
+        """
+        wait = self.reserve(max_wait)
+        if wait is None:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    def record(self, status, latency, retry_after=None):
+        """Update the rate from a response.
+
+        Args:
+            status (int): HTTP status code
+            latency (float): Response time in seconds
+            retry_after (float): Seconds from the Retry-After header, if any
+        """
+        with self._lock:
+            self.requests += 1
+
+            if status == 429 or status >= 500:
+                if status == 429:
+                    self.throttled += 1
+                else:
+                    self.errors += 1
+                self._back_off(self.decrease)
+                if retry_after is not None:
+                    self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+                return
+
+            # Redirects and 4xx say the host is responding, but their latency
+            # isn't comparable with full page responses
+            if 200 <= status < 300:
+                self.recent_latencies.append(latency)
+                if self.avg_latency is None:
+                    self.avg_latency = latency
+                else:
+                    self.avg_latency = 0.8 * self.avg_latency + 0.2 * latency
+
+                if self.avg_latency > self.latency_tolerance * max(min(self.recent_latencies), 0.001):
+                    self._back_off(self.latency_decrease)
+                    return
+
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def record_timeout(self):
+        """Update the rate after a request timed out."""
+        with self._lock:
+            self.requests += 1
+            self.errors += 1
+            self._back_off(self.decrease)
+
+    def _back_off(self, factor):
+        self.rate = max(self.min_rate, self.rate * factor)
+        # Apply the slower pace to requests already queued
+        self.next_slot = max(self.next_slot, time.monotonic() + 1.0 / self.rate)
+
+    def snapshot(self):
+        """Current state, for metrics."""
+        with self._lock:
+            return {
+                'rate': round(self.rate, 3),
+                'blocked_for': round(max(0.0, self.blocked_until - time.monotonic()), 3),
+                'avg_latency': None if self.avg_latency is None else round(self.avg_latency, 3),
+                'min_latency': round(min(self.recent_latencies), 3) if self.recent_latencies else None,
+                'requests': self.requests,
+                'throttled': self.throttled,
+                'errors': self.errors
+            }
+
+
+class RateLimiter:
+    """Per-host rate controllers shared by every scraper in a process."""
+
+    def __init__(self, max_rate=10.0, **controller_options):
+        """Initialize the limiter.
+
+        Args:
+            max_rate (float): Highest request rate per host in requests per second
+            controller_options: Further HostRateController arguments
+        """
+        self.max_rate = max_rate
+        self.controller_options = controller_options
+        self._controllers = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """Create a limiter capped at RATE_LIMIT_MAX_RATE requests per second (default 10)."""
+        return cls(max_rate=float(os.environ.get('RATE_LIMIT_MAX_RATE', 10.0)))
+
+    def for_url(self, url, initial_delay=1.0):
+        """Return the controller for a URL's host, creating it if needed.
+
+        Args:
+            url (str): Request URL
+            initial_delay (float): Starting delay between requests for a host
+                that hasn't been contacted yet; 0 starts at the maximum rate
+        """
+        host = urlsplit(url).netloc
+        with self._lock:
+            controller = self._controllers.get(host)
+            if controller is None:
+                initial_rate = 1.0 / initial_delay if initial_delay > 0 else self.max_rate
+                controller = HostRateController(initial_rate=initial_rate, max_rate=self.max_rate,
+                                                **self.controller_options)
+                self._controllers[host] = controller
+            return controller
+
+    def snapshot(self):
+        """Current state of every host's controller, for metrics."""
+        with self._lock:
+            controllers = dict(self._controllers)
+        return {host: controller.snapshot() for host, controller in controllers.items()}
+
+
+default_rate_limiter = RateLimiter.from_env()
+
+
+class RateControlledSession(requests.Session):
+    """Session that paces every request through a per-host rate controller.
+
+    Requests served by an adapter replaying an archive bypass the controller.
+    """
+
+    def __init__(self, rate_limiter=None, initial_delay=1.0, deadline=None):
+        """Initialize the session.
+
+        Args:
+            rate_limiter (RateLimiter): Limiter to use, defaults to the process-wide one
+            initial_delay (float): Starting delay between requests to a new host
+            deadline (Deadline): Budget that caps the pacing wait and timeout of
+                every request made through this session
+        """
+        super().__init__()
+        self.rate_limiter = rate_limiter or default_rate_limiter
+        self.initial_delay = initial_delay
+        self.deadline = deadline
+
+    def send(self, request, **kwargs):
+        if getattr(self.get_adapter(request.url), 'replaying', False):
+            # Replayed responses never reach the host, so there is nothing to
+            # pace or learn from; only the archive's own latency setting applies
+            if self.deadline is not None and self.deadline.expired():
+                raise DeadlineExceeded(f"Deadline reached before {request.url} could be sent", request=request)
+            return super().send(request, **kwargs)
+
+        controller = self.rate_limiter.for_url(request.url, self.initial_delay)
+
+        timeout = kwargs.get('timeout')
+        read_body = False
+        if self.deadline is not None:
+            if not controller.acquire(max_wait=self.deadline.remaining()):
+                raise DeadlineExceeded(f"Deadline reached before {request.url} could be sent", request=request)
+            kwargs['timeout'] = self.deadline.timeout(timeout)
+            # The read timeout applies to each socket read, so a body trickled
+            # in slowly could outlast it; read the body ourselves instead
+            if not kwargs.get('stream'):
+                kwargs['stream'] = True
+                read_body = True
+        else:
+            controller.acquire()
+
+        try:
+            response = super().send(request, **kwargs)
+        except requests.exceptions.Timeout as e:
+            # A timeout shortened by our own deadline says nothing about the host,
+            # and one on a later redirect hop belongs to that hop's host
+            if kwargs.get('timeout') == timeout and e.request is request:
+                controller.record_timeout()
+            raise
+
+        # Redirects are followed through send() too, so every later hop has
+        # already been recorded against its own host; record only this one
+        hop = response.history[0] if response.history else response
+        controller.record(
+            hop.status_code,
+            hop.elapsed.total_seconds(),
+            parse_retry_after(hop.headers.get('Retry-After'))
+        )
+
+        if read_body:
+            self._read_body_before_deadline(response)
+        return response
+
+    def _read_body_before_deadline(self, response):
+        """Load a streamed response body, giving up when the deadline passes.
+
+        read1 returns after a single socket read, so the deadline is checked
+        even while a body trickles in a few bytes at a time.
+        """
+        if response._content_consumed or response.raw is None or not hasattr(response.raw, 'read1'):
+            # Already loaded (e.g. read by an archive recording it) or an old urllib3
+            response.content
+            return
+
+        chunks = []
+        try:
+            while True:
+                if self.deadline.expired():
+                    raise DeadlineExceeded(f"Deadline reached while reading {response.url}",
+                                           request=response.request, response=response)
+                try:
+                    chunk = response.raw.read1(8192, decode_content=True)
+                except urllib3.exceptions.HTTPError as e:
+                    raise requests.exceptions.ConnectionError(e, request=response.request)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        finally:
+            response.close()
+
+        response._content = b''.join(chunks)
+        response._content_consumed = True
@@ -0,0 +1,227 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+_MISSING = object()
+
+_instances = {}
+_instances_lock = threading.Lock()
+
+
+class SharedCache:
+    """Cache shared by every process on a host, backed by a local SQLite file.
+
+    Values must be JSON-serializable. Entries expire after a TTL and the oldest
+    entries are evicted once `max_entries` or `max_bytes` is exceeded, so caching
+    whole HTML pages can't grow the file without bound. `get_or_compute` takes a
+    per-key lock row so that when several uvicorn workers miss the same key at
+    once, only one of them does the upstream work and the others wait for it.
+    """
+
+    def __init__(self, path, max_entries=10000, max_bytes=100 * 1024 * 1024, default_ttl=300, lock_timeout=60,
+                 poll_interval=0.1):
+        """Initialize the cache.
+
+        Args:
+            path (str): Path of the SQLite database file
+            max_entries (int): Maximum number of entries kept
+            max_bytes (int): Maximum total size of the stored values in bytes
+            default_ttl (float): Time to live of entries in seconds
+            lock_timeout (float): Seconds after which a compute lock is considered
+                abandoned, e.g. because its worker died
+            poll_interval (float): Seconds between checks while waiting for
+                another worker's compute
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self._local = threading.local()
+
+        with self._connect() as conn:
+            conn.execute('''CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            )''')
+            conn.execute('CREATE INDEX IF NOT EXISTS entries_stored_at ON entries (stored_at)')
+            conn.execute('''CREATE TABLE IF NOT EXISTS locks (
+                key TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )''')
+
+    @classmethod
+    def from_env(cls):
+        """Return the process-wide cache configured through environment variables.
+
+        SHARED_CACHE_PATH enables the cache; SHARED_CACHE_MAX_ENTRIES,
+        SHARED_CACHE_MAX_BYTES and SHARED_CACHE_TTL (seconds) configure it.
+
+        Returns:
+            SharedCache: The cache for this path, or None if not enabled
+        """
+        path = os.environ.get('SHARED_CACHE_PATH')
+        if not path:
+            return None
+
+        with _instances_lock:
+            if path not in _instances:
+                _instances[path] = cls(
+                    path,
+                    max_entries=int(os.environ.get('SHARED_CACHE_MAX_ENTRIES', 10000)),
+                    max_bytes=int(os.environ.get('SHARED_CACHE_MAX_BYTES', 100 * 1024 * 1024)),
+                    default_ttl=float(os.environ.get('SHARED_CACHE_TTL', 300))
+                )
+            return _instances[path]
+
+    def _connect(self):
+        # sqlite3 connections can't be shared between threads, so keep one per thread
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, key, default=None):
+        """Return the cached value for a key, or `default` if missing or expired."""
+        row = self._connect().execute(
+            'SELECT value FROM entries WHERE key = ? AND expires_at > ?', (key, time.time())
+        ).fetchone()
+        if row is None:
+            return default
+        return json.loads(row[0])
+
+    def set(self, key, value, ttl=None):
+        """Store a value, evicting the oldest entries if the cache is full.
+
+        Args:
+            key (str): Cache key
+            value: JSON-serializable value
+            ttl (float): Time to live in seconds, defaults to `default_ttl`
+        """
+        now = time.time()
+        expires_at = now + (self.default_ttl if ttl is None else ttl)
+        # json.dumps escapes non-ASCII characters, so its length is the size in bytes
+        data = json.dumps(value)
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute(
+                'INSERT OR REPLACE INTO entries (key, value, size, stored_at, expires_at) VALUES (?, ?, ?, ?, ?)',
+                (key, data, len(data), now, expires_at)
+            )
+            self._evict(conn, now)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    def _evict(self, conn, now):
+        conn.execute('DELETE FROM entries WHERE expires_at <= ?', (now,))
+        excess = conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0] - self.max_entries
+        if excess > 0:
+            conn.execute(
+                'DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY stored_at LIMIT ?)',
+                (excess,)
+            )
+
+        # A value larger than the whole cache is dropped rather than flushing everything else
+        conn.execute('DELETE FROM entries WHERE size > ?', (self.max_bytes,))
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total > self.max_bytes:
+            # Keep the newest entries that fit within max_bytes
+            conn.execute(
+                '''DELETE FROM entries WHERE key IN (
+                    SELECT key FROM (
+                        SELECT key, SUM(size) OVER (ORDER BY stored_at DESC, key) AS kept FROM entries
+                    ) WHERE kept > ?
+                )''',
+                (self.max_bytes,)
+            )
+
+    def delete(self, key):
+        self._connect().execute('DELETE FROM entries WHERE key = ?', (key,))
+
+    def clear(self):
+        conn = self._connect()
+        conn.execute('DELETE FROM entries')
+        conn.execute('DELETE FROM locks')
+
+    def __len__(self):
+        return self._connect().execute(
+            'SELECT COUNT(*) FROM entries WHERE expires_at > ?', (time.time(),)
+        ).fetchone()[0]
+
+    def _acquire(self, key, owner):
+        now = time.time()
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('DELETE FROM locks WHERE key = ? AND expires_at <= ?', (key, now))
+            inserted = conn.execute(
+                'INSERT OR IGNORE INTO locks (key, owner, expires_at) VALUES (?, ?, ?)',
+                (key, owner, now + self.lock_timeout)
+            ).rowcount
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return inserted == 1
+
+    def _release(self, key, owner):
+        self._connect().execute('DELETE FROM locks WHERE key = ? AND owner = ?', (key, owner))
+
+    def get_or_compute(self, key, compute, ttl=None, timeout=None):
+        """Return the cached value for a key, computing and storing it on a miss.
+
+        Only one caller across all processes computes a given key at a time;
+        the others wait for its result. A compute that returns None is not
+        cached, so failures are retried by the next caller.
+
+        Args:
+            key (str): Cache key
+            compute (callable): Function returning the value to cache
+            ttl (float): Time to live in seconds, defaults to `default_ttl`
+            timeout (float): Longest to wait for another worker's compute before
+                computing ourselves, defaults to `lock_timeout`
+
+        Returns:
+            The cached or freshly computed value
+        """
+        owner = uuid.uuid4().hex
+        deadline = time.time() + (self.lock_timeout if timeout is None else min(timeout, self.lock_timeout))
+
+        while True:
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+
+            if self._acquire(key, owner):
+                try:
+                    # Another worker may have stored the value since our miss
+                    value = self.get(key, _MISSING)
+                    if value is not _MISSING:
+                        return value
+
+                    value = compute()
+                    if value is not None:
+                        self.set(key, value, ttl)
+                    return value
+                finally:
+                    self._release(key, owner)
+
+            if time.time() >= deadline:
+                # The lock holder is taking too long; don't stall the request
+                return compute()
+
+            time.sleep(self.poll_interval)
@@ -1,11 +1,26 @@
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import patch, MagicMock
 
+import crypto_influencer_analyser
 from crypto_influencer_analyser import (
     CoinMarketCapScraper,
     CryptoInfluencerScraper,
     CryptoTwitterAnalyser,
+    analyse_influencers,
     analyse_multiple_influencers,
 )
+from loadtest.stub_server import StubConfig, StubUpstreamServer
+from models import (
+    MentionAnalysis,
+    Profile,
+    ProfileAnalysis,
+    Recommendation,
+    SentimentEntry,
+    Tweet,
+)
 
 
 def test_coinmarketcap_scraper_fallback(monkeypatch):
@@ -59,11 +74,11 @@ def test_analyse_mentions_basic():
     assert results["sentiment_analysis"]["DOGE"]["sentiment"] == "bearish"
 
 
-@patch("crypto_influencer_analyser.CryptoTwitterAnalyser.analyse_twitter_profile")
+@patch("crypto_influencer_analyser.CryptoTwitterAnalyser.analyse_profile")
 def test_analyse_multiple_influencers(mock_analyse):
     """Test aggregation logic from multiple influencers."""
 
-    mock_analyse.side_effect = [
+    mock_analyse.side_effect = [ProfileAnalysis.from_dict(result) for result in [
         {
             "profile": {"username": "user1", "bio": "", "name": "User One"},
             "analysis": {
@@ -95,7 +110,7 @@ def test_analyse_multiple_influencers(mock_analyse):
             "tweet_count": 2,
             "tweets_analysed": [],
         }
-    ]
+    ]]
 
     results = analyse_multiple_influencers(["user1", "user2"])
 
@@ -103,3 +118,129 @@ def test_analyse_multiple_influencers(mock_analyse):
     assert "BTC" in results["mentions_by_crypto"]
     assert results["top_recommendations"][0]["symbol"] == "BTC"
     assert results["top_recommendations"][0]["influencer_count"] == 2
+    assert results["partial"] is False
+    assert results["skipped"] == []
+
+
+def test_analyse_multiple_influencers_deadline(monkeypatch):
+    """Test that a deadline returns partial results from the completed profiles."""
+    server = StubUpstreamServer(config=StubConfig(latency=0.4, jitter=0)).start()
+    monkeypatch.setattr(crypto_influencer_analyser, "TWITTER_URL", server.url)
+    usernames = ["user1", "user2", "user3", "user4"]
+
+    try:
+        start = time.monotonic()
+        results = analyse_multiple_influencers(usernames, delay=0, deadline=0.6)
+        elapsed = time.monotonic() - start
+    finally:
+        server.stop()
+
+    assert elapsed < 1.5
+    assert results["partial"] is True
+    assert results["influencers_analysed"] == 1
+    assert results["individual_analyses"][0]["profile"]["username"] == "user1"
+    assert results["skipped"] == ["user2", "user3", "user4"]
+
+
+def test_analyse_multiple_influencers_deadline_throttled_host(monkeypatch):
+    """Test that profiles the rate controller can't send before the deadline are skipped."""
+    server = StubUpstreamServer(config=StubConfig(latency=0, jitter=0, throttle_rate=1.0, retry_after=30)).start()
+    monkeypatch.setattr(crypto_influencer_analyser, "TWITTER_URL", server.url)
+
+    try:
+        start = time.monotonic()
+        results = analyse_multiple_influencers(["a", "b", "c"], delay=0, deadline=5)
+        elapsed = time.monotonic() - start
+    finally:
+        server.stop()
+
+    assert elapsed < 2
+    assert results["partial"] is True
+    assert results["influencers_analysed"] == 0
+    assert results["skipped"] == ["a", "b", "c"]
+
+
+def _synthetic_analysis(username):
+    return ProfileAnalysis(
+        profile=Profile(username=username, name=username, bio=f"Bio of {username}"),
+        analysis=MentionAnalysis(
+            mentioned_cryptocurrencies={"BTC": 3, "ETH": 2},
+            sentiment_analysis={
+                "BTC": SentimentEntry(mentions=3, sentiment="bullish", bullish_score=4, bearish_score=0),
+                "ETH": SentimentEntry(mentions=2, sentiment="neutral", bullish_score=1, bearish_score=1),
+            },
+            potential_recommendations=[Recommendation(symbol="BTC", strength=6, sentiment="bullish")],
+        ),
+        tweets=[Tweet(text=f"{username} tweet {i}: BTC looks bullish") for i in range(20)],
+    )
+
+
+def _retained_memory(function, usernames):
+    """Run an aggregation over synthetic profiles and measure what its result keeps alive."""
+    results_iter = (_synthetic_analysis(username) for username in usernames)
+
+    with patch("crypto_influencer_analyser.CryptoTwitterAnalyser.analyse_profile",
+               side_effect=lambda username: next(results_iter)), \
+            patch("builtins.print"):
+        tracemalloc.start()
+        try:
+            result = function(usernames, delay=0)
+            retained, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return result, retained
+
+
+def test_analyse_influencers_retains_less_than_dicts():
+    """Test that the typed report keeps less memory alive than the dict form."""
+    usernames = [f"user{i}" for i in range(1000)]
+
+    report, typed = _retained_memory(analyse_influencers, usernames)
+    results, dicts = _retained_memory(analyse_multiple_influencers, usernames)
+
+    assert len(report.analyses) == 1000
+    assert results["influencers_analysed"] == 1000
+    assert report.to_dict()["individual_analyses"][0] == results["individual_analyses"][0]
+    assert typed < dicts * 0.75
+
+
+class _SlowBodyHandler(BaseHTTPRequestHandler):
+    """Sends headers at once, then the body one byte every 0.1 seconds."""
+
+    def do_GET(self):
+        body = b"<html><body>" + b" " * 60 + b"</body></html>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            for i in range(len(body)):
+                self.wfile.write(body[i:i + 1])
+                self.wfile.flush()
+                time.sleep(0.1)
+        except ConnectionError:
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_analyse_multiple_influencers_deadline_bounds_slow_body(monkeypatch):
+    """Test that a body trickled in slowly can't stretch the call past its deadline."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowBodyHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(crypto_influencer_analyser, "TWITTER_URL", f"http://127.0.0.1:{server.server_port}")
+
+    try:
+        start = time.monotonic()
+        results = analyse_multiple_influencers(["a", "b"], delay=0, deadline=0.5)
+        elapsed = time.monotonic() - start
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert elapsed < 1.0
+    assert results["partial"] is True
+    assert results["influencers_analysed"] == 0
+    assert results["skipped"] == ["a", "b"]
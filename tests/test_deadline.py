@@ -0,0 +1,38 @@
+import time
+
+import pytest
+
+from deadline import Deadline, DeadlineExceeded
+from rate_control import RateControlledSession, RateLimiter
+
+
+def test_timeout_is_capped_at_remaining_budget():
+    """Test that request timeouts never outlast the deadline."""
+    deadline = Deadline(1.0)
+    assert 0.9 < deadline.timeout(15) <= 1.0
+    assert deadline.timeout(0.5) == 0.5
+    assert 0.9 < deadline.timeout(None) <= 1.0
+    connect, read = deadline.timeout((0.2, 15))
+    assert connect == 0.2 and 0.9 < read <= 1.0
+
+
+def test_expired_deadline_raises():
+    """Test that no request is allowed once the budget is spent."""
+    deadline = Deadline(0.01)
+    time.sleep(0.02)
+    assert deadline.expired()
+    with pytest.raises(DeadlineExceeded):
+        deadline.timeout(15)
+
+
+def test_session_refuses_pacing_wait_past_deadline():
+    """Test that a request is not queued behind the rate limit beyond the deadline."""
+    limiter = RateLimiter()
+    controller = limiter.for_url("https://twitter.com/", initial_delay=0)
+    controller.record(429, 0.1, retry_after=30)
+
+    session = RateControlledSession(limiter, deadline=Deadline(1.0))
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        session.get("https://twitter.com/someone", timeout=15)
+    assert time.monotonic() - start < 0.5
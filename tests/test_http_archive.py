@@ -0,0 +1,166 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+import requests
+
+from crypto_influencer_analyser import WebScraper, create_session
+from deadline import Deadline
+from http_archive import RECORD, REPLAY, HttpArchive
+from rate_control import RateLimiter
+
+
+class _PageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = b"<html><title>Archived</title><body><p>@satoshi</p></body></html>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _StatusHandler(BaseHTTPRequestHandler):
+    """Answers with whatever status the server is currently set to."""
+
+    def do_GET(self):
+        body = f"status {self.server.status}".encode("utf-8")
+        self.send_response(self.server.status)
+        self.send_header("Content-Length", str(len(body)))
+        if self.server.status == 429:
+            self.send_header("Retry-After", "3")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = HTTPServer(("127.0.0.1", 0), _PageHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_record_then_replay_offline(tmp_path, server_url):
+    """Test that recorded responses are served in replay mode without the upstream."""
+    url = f"{server_url}/page"
+
+    recorder = WebScraper(delay=0, archive=HttpArchive(str(tmp_path), mode=RECORD))
+    recorded = recorder.get_page(url)
+    assert recorded.title.text == "Archived"
+    assert list(tmp_path.glob("*.json.gz"))
+
+    replayer = WebScraper(delay=0, archive=HttpArchive(str(tmp_path), mode=REPLAY))
+    replayed = replayer.get_page(f"{server_url}/page")
+    assert replayed.title.text == "Archived"
+
+    # Requests that were never recorded fail like an unreachable host
+    assert replayer.get_page(f"{server_url}/missing") is None
+
+
+def test_replay_response_fields(tmp_path, server_url):
+    """Test that status, headers and body survive the round trip."""
+    url = f"{server_url}/page"
+    create_session(HttpArchive(str(tmp_path), mode=RECORD)).get(url, timeout=5)
+
+    response = create_session(HttpArchive(str(tmp_path), mode=REPLAY)).get(url, timeout=5)
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == "text/html; charset=utf-8"
+    assert "@satoshi" in response.text
+
+
+def test_replay_with_deadline(tmp_path, server_url):
+    """Test that replayed responses are readable when a deadline streams bodies."""
+    url = f"{server_url}/page"
+    create_session(HttpArchive(str(tmp_path), mode=RECORD)).get(url, timeout=5)
+
+    session = create_session(HttpArchive(str(tmp_path), mode=REPLAY), deadline=Deadline(5))
+    assert "@satoshi" in session.get(url, timeout=5).text
+
+
+def test_record_with_deadline(tmp_path, server_url):
+    """Test that bodies already read by the recording archive aren't read again."""
+    url = f"{server_url}/page"
+    session = create_session(HttpArchive(str(tmp_path), mode=RECORD), deadline=Deadline(5))
+    assert "@satoshi" in session.get(url, timeout=5).text
+    assert "@satoshi" in create_session(HttpArchive(str(tmp_path), mode=REPLAY)).get(url, timeout=5).text
+
+
+def test_failures_do_not_replace_good_recordings(tmp_path):
+    """Test that re-recording a 429 or 5xx keeps the earlier 2xx entry unless opted in."""
+    server = HTTPServer(("127.0.0.1", 0), _StatusHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/page"
+
+    def record(status, **options):
+        server.status = status
+        archive = HttpArchive(str(tmp_path), mode=RECORD, **options)
+        create_session(archive, RateLimiter(), delay=0).get(url, timeout=5)
+        return HttpArchive(str(tmp_path)).load("GET", url)["status"]
+
+    try:
+        assert record(200) == 200
+        assert record(429) == 200
+        assert record(503) == 200
+        assert record(404) == 404
+        assert record(200) == 200
+        assert record(503, replace_with_failures=True) == 503
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_replay_bypasses_rate_control(tmp_path):
+    """Test that replaying an archived 429 neither paces nor blocks the host."""
+    server = HTTPServer(("127.0.0.1", 0), _StatusHandler)
+    server.status = 429
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/page"
+    try:
+        create_session(HttpArchive(str(tmp_path), mode=RECORD), RateLimiter(), delay=0).get(url, timeout=5)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    limiter = RateLimiter()
+    session = create_session(HttpArchive(str(tmp_path), mode=REPLAY), limiter, delay=1.0)
+    start = time.monotonic()
+    for _ in range(3):
+        response = session.get(url, timeout=5)
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "3"
+    assert time.monotonic() - start < 0.5
+    assert limiter.snapshot() == {}
+
+
+def test_replay_missing_entry_raises(tmp_path):
+    """Test that unarchived URLs raise a ConnectionError in replay mode."""
+    session = create_session(HttpArchive(str(tmp_path), mode=REPLAY))
+    with pytest.raises(requests.exceptions.ConnectionError):
+        session.get("https://coinmarketcap.com/?page=1", timeout=5)
+
+
+def test_archive_from_env(tmp_path, monkeypatch):
+    """Test configuring the archive through environment variables."""
+    monkeypatch.delenv("HTTP_ARCHIVE_PATH", raising=False)
+    assert HttpArchive.from_env() is None
+
+    monkeypatch.setenv("HTTP_ARCHIVE_PATH", str(tmp_path))
+    monkeypatch.setenv("HTTP_ARCHIVE_MODE", "record")
+    monkeypatch.setenv("HTTP_ARCHIVE_LATENCY", "0.5")
+    archive = HttpArchive.from_env()
+    assert archive.mode == RECORD
+    assert archive.latency == 0.5
+    assert archive.replace_with_failures is False
+
+    monkeypatch.setenv("HTTP_ARCHIVE_REPLACE_FAILURES", "1")
+    assert HttpArchive.from_env().replace_with_failures is True
@@ -0,0 +1,76 @@
+import pytest
+
+import crypto_influencer_analyser
+from crypto_influencer_analyser import (
+    CoinMarketCapScraper,
+    CryptoInfluencerScraper,
+    CryptoTwitterAnalyser,
+)
+from loadtest.harness import parse_args, percentile, run_load
+from loadtest.stub_server import StubConfig, StubUpstreamServer
+
+
+@pytest.fixture
+def stub():
+    server = StubUpstreamServer(config=StubConfig(latency=0, jitter=0)).start()
+    yield server
+    server.stop()
+
+
+def test_scrapers_parse_stub_pages(stub, monkeypatch):
+    """Test that the stub pages are understood by the real scrapers."""
+    monkeypatch.setattr(crypto_influencer_analyser, "COINMARKETCAP_URL", stub.url)
+    monkeypatch.setattr(crypto_influencer_analyser, "TWITTER_URL", stub.url)
+
+    cryptos = CoinMarketCapScraper(delay=0).get_top_cryptocurrencies(limit=10)
+    assert len(cryptos) == 10
+    assert cryptos["BTC"]["name"] == "Bitcoin"
+
+    influencers = CryptoInfluencerScraper(delay=0).extract_influencers_from_ajmarketing(f"{stub.url}/post/list")
+    assert "stub_influencer_1" in [inf["handle"] for inf in influencers]
+
+    result = CryptoTwitterAnalyser(delay=0).analyse_twitter_profile("stub_user_1")
+    assert "error" not in result
+    assert result["tweet_count"] == 20
+    assert result["analysis"]["total_crypto_mentions"] > 0
+    assert stub.stats[("twitter_profile", 200)] == 1
+
+
+def test_stub_throttles():
+    """Test that the stub answers with 429 and Retry-After when throttling."""
+    server = StubUpstreamServer(config=StubConfig(latency=0, jitter=0, throttle_rate=1.0, retry_after=7)).start()
+    try:
+        session = CoinMarketCapScraper(delay=0).session
+        response = session.get(f"{server.url}/?page=1", timeout=5)
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "7"
+    finally:
+        server.stop()
+
+
+def test_percentile():
+    """Test nearest-rank percentiles."""
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([3.0], 99) == 3.0
+    assert percentile([], 50) == 0.0
+
+
+def test_run_load_counts_client_queueing():
+    """Test that time spent queued behind busy client workers is measured, not omitted."""
+    server = StubUpstreamServer(config=StubConfig(latency=0.2, jitter=0)).start()
+    try:
+        args = parse_args(["--rate", "10", "--duration", "0.5", "--concurrency", "1",
+                           "--endpoints", "influencers"])
+        results = run_load(server.url, server.url, args)
+    finally:
+        server.stop()
+
+    latencies = results["latencies"]["influencers"]
+    lags = results["send_lags"]["influencers"]
+    assert len(latencies) == 5
+    # Serialized 0.2s requests scheduled 0.1s apart: the last one waits ~0.4s to be sent
+    assert max(lags) > 0.3
+    assert max(latencies) > 0.5
@@ -28,3 +28,9 @@ def test_analyse_multiple():
     response = client.post("/analyse-multiple", params={"usernames": ["elonmusk", "VitalikButerin"]})
     assert response.status_code == 200
     assert "individual_analyses" in response.json()
+
+
+def test_get_metrics():
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert "rate_control" in response.json()
@@ -0,0 +1,73 @@
+from models import (
+    AnalysisBatch,
+    MentionAnalysis,
+    Profile,
+    ProfileAnalysis,
+    Recommendation,
+    SentimentEntry,
+    Tweet,
+)
+
+
+def _make_analysis(username, mentions, recommendations):
+    return ProfileAnalysis(
+        profile=Profile(username=username, name=username, bio=""),
+        analysis=MentionAnalysis(
+            mentioned_cryptocurrencies=mentions,
+            sentiment_analysis={
+                symbol: SentimentEntry(mentions=count, sentiment="bullish", bullish_score=2, bearish_score=0)
+                for symbol, count in mentions.items()
+            },
+            potential_recommendations=[
+                Recommendation(symbol=symbol, strength=strength, sentiment="bullish")
+                for symbol, strength in recommendations
+            ],
+        ),
+        tweets=[Tweet(text="BTC bullish")],
+    )
+
+
+def test_profile_analysis_round_trips_json_shape():
+    """Test that the typed model converts to and from the API's JSON shape."""
+    result = _make_analysis("user1", {"BTC": 3}, [("BTC", 3)])
+    data = result.to_dict()
+
+    assert data["tweet_count"] == 1
+    assert data["tweets_analysed"] == [{"text": "BTC bullish", "date": ""}]
+    assert data["analysis"]["total_crypto_mentions"] == 3
+    assert data["analysis"]["potential_recommendations"][0] == {
+        "symbol": "BTC", "strength": 3, "sentiment": "bullish"
+    }
+    assert "error" not in data
+    assert ProfileAnalysis.from_dict(data) == result
+
+
+def test_failed_profile_analysis_includes_error():
+    """Test the empty result returned when a profile cannot be scraped."""
+    data = ProfileAnalysis.failed("user1", "boom").to_dict()
+
+    assert data["error"] == "boom"
+    assert data["profile"]["bio"] == "Could not retrieve bio"
+    assert data["analysis"]["mentioned_cryptocurrencies"] == {}
+    assert data["tweet_count"] == 0
+
+
+def test_models_use_slots():
+    """Test that per-profile objects don't carry an instance __dict__."""
+    assert not hasattr(Tweet(text="hi"), "__dict__")
+    assert not hasattr(AnalysisBatch(), "__dict__")
+
+
+def test_analysis_batch_aggregates():
+    """Test columnar aggregation of mentions and recommendations."""
+    batch = AnalysisBatch()
+    batch.add(_make_analysis("user1", {"BTC": 2, "ETH": 1}, [("BTC", 4)]))
+    batch.add(_make_analysis("user2", {"BTC": 1, "SOL": 5}, [("BTC", 2), ("SOL", 6)]))
+
+    assert len(batch) == 2
+    assert batch.symbols == ["BTC", "ETH", "SOL"]
+    assert batch.mention_totals() == {"BTC": 3, "ETH": 1, "SOL": 5}
+
+    scores, influencer_counts = batch.recommendation_totals()
+    assert scores == {"BTC": 6, "SOL": 6}
+    assert influencer_counts == {"BTC": 2, "SOL": 1}
@@ -0,0 +1,143 @@
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from loadtest.stub_server import StubConfig, StubUpstreamServer
+from rate_control import HostRateController, RateControlledSession, RateLimiter, parse_retry_after
+
+
+def test_parse_retry_after():
+    """Test parsing Retry-After as seconds or as an HTTP date."""
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert 50 < parse_retry_after(formatdate(time.time() + 60, usegmt=True)) <= 60
+
+
+def test_ramps_up_when_healthy():
+    """Test additive increase on healthy responses, capped at max_rate."""
+    controller = HostRateController(initial_rate=1.0, max_rate=1.5, increase=0.2)
+    for _ in range(3):
+        controller.record(200, 0.1)
+    assert controller.rate == 1.5
+
+
+def test_backs_off_on_throttling_and_errors():
+    """Test multiplicative decrease on 429s and 5xx, bounded by min_rate."""
+    controller = HostRateController(initial_rate=4.0, min_rate=0.5, decrease=0.5)
+    controller.record(429, 0.1)
+    assert controller.rate == 2.0
+    controller.record(503, 0.1)
+    assert controller.rate == 1.0
+    controller.record_timeout()
+    controller.record(500, 0.1)
+    assert controller.rate == 0.5
+
+    snapshot = controller.snapshot()
+    assert snapshot["throttled"] == 1
+    assert snapshot["errors"] == 3
+
+
+def test_backs_off_on_latency_growth():
+    """Test that latency well above the best seen slows the rate down."""
+    controller = HostRateController(initial_rate=2.0, latency_tolerance=3.0, latency_decrease=0.5)
+    controller.record(200, 0.1)
+    rate = controller.rate
+    for _ in range(10):
+        controller.record(200, 2.0)
+    assert controller.rate < rate
+
+
+def test_recovers_from_fast_latency_outlier():
+    """Test that one unusually fast response doesn't pin the host at min_rate."""
+    controller = HostRateController(initial_rate=1.0, min_rate=0.1, max_rate=5.0, latency_window=20)
+    controller.record(200, 0.01)
+    for _ in range(200):
+        controller.record(200, 0.2)
+    assert controller.rate == 5.0
+
+
+def test_non_2xx_latency_is_not_sampled():
+    """Test that fast 404s and redirects don't set the latency baseline."""
+    controller = HostRateController(initial_rate=1.0, min_rate=0.1, max_rate=5.0)
+    controller.record(404, 0.01)
+    controller.record(301, 0.01)
+    for _ in range(10):
+        controller.record(200, 0.2)
+    assert controller.rate > 1.0
+    assert controller.snapshot()["min_latency"] == 0.2
+
+
+def test_retry_after_blocks_host():
+    """Test that Retry-After delays the next request slot."""
+    controller = HostRateController(initial_rate=100.0, max_rate=100.0)
+    assert controller.reserve() == 0
+    controller.record(429, 0.1, retry_after=5)
+    assert 4.5 < controller.reserve() <= 5
+
+
+def test_limiter_tracks_hosts_separately():
+    """Test per-host controllers and the initial delay for new hosts."""
+    limiter = RateLimiter(max_rate=10.0)
+    first = limiter.for_url("https://twitter.com/a", initial_delay=2.0)
+    assert limiter.for_url("https://twitter.com/b") is first
+    assert first.rate == 0.5
+    assert limiter.for_url("https://coinmarketcap.com/?page=1", initial_delay=0).rate == 10.0
+    assert set(limiter.snapshot()) == {"twitter.com", "coinmarketcap.com"}
+
+
+def test_session_honours_retry_after():
+    """Test that a 429 with Retry-After from upstream pauses the host."""
+    server = StubUpstreamServer(config=StubConfig(latency=0, jitter=0, throttle_rate=1.0, retry_after=30)).start()
+    try:
+        limiter = RateLimiter()
+        session = RateControlledSession(limiter, initial_delay=0)
+        assert session.get(f"{server.url}/?page=1", timeout=5).status_code == 429
+
+        controller = limiter.for_url(server.url)
+        assert controller.throttled == 1
+        assert controller.snapshot()["blocked_for"] > 25
+    finally:
+        server.stop()
+
+
+class _RedirectHandler(BaseHTTPRequestHandler):
+    """Redirects /start to /final on localhost, which answers with a 429."""
+
+    def do_GET(self):
+        if self.path == "/start":
+            self.send_response(302)
+            self.send_header("Location", f"http://localhost:{self.server.server_port}/final")
+        else:
+            self.send_response(429)
+            self.send_header("Retry-After", "30")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_session_records_redirect_hops_per_host():
+    """Test that each redirect hop is recorded once, against its own host."""
+    server = HTTPServer(("127.0.0.1", 0), _RedirectHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        limiter = RateLimiter()
+        session = RateControlledSession(limiter, initial_delay=0)
+        response = session.get(f"http://127.0.0.1:{server.server_port}/start", timeout=5)
+        assert response.status_code == 429
+        assert response.history[0].status_code == 302
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    origin = limiter.snapshot()[f"127.0.0.1:{server.server_port}"]
+    target = limiter.snapshot()[f"localhost:{server.server_port}"]
+    assert origin["requests"] == 1
+    assert origin["throttled"] == 0
+    assert origin["blocked_for"] == 0
+    assert target["requests"] == 1
+    assert target["throttled"] == 1
+    assert target["blocked_for"] > 25
@@ -0,0 +1,120 @@
+import threading
+import time
+
+from crypto_influencer_analyser import CoinMarketCapScraper, CryptoTwitterAnalyser
+from models import MentionAnalysis, Profile, ProfileAnalysis
+from shared_cache import SharedCache
+
+
+def test_get_set_and_ttl(tmp_path):
+    """Test storing values and expiring them after their TTL."""
+    cache = SharedCache(str(tmp_path / "cache.db"))
+    assert cache.get("missing") is None
+
+    cache.set("key", {"a": [1, 2]})
+    cache.set("short", "value", ttl=0.05)
+    assert cache.get("key") == {"a": [1, 2]}
+    assert cache.get("short") == "value"
+
+    time.sleep(0.1)
+    assert cache.get("short") is None
+    assert len(cache) == 1
+
+
+def test_evicts_oldest_entries(tmp_path):
+    """Test that the cache stays within max_entries."""
+    cache = SharedCache(str(tmp_path / "cache.db"), max_entries=3)
+    for i in range(5):
+        cache.set(f"key{i}", i)
+
+    assert len(cache) == 3
+    assert cache.get("key0") is None
+    assert cache.get("key4") == 4
+
+
+def test_evicts_oldest_entries_over_max_bytes(tmp_path):
+    """Test that the total size of cached values stays within max_bytes."""
+    cache = SharedCache(str(tmp_path / "cache.db"), max_bytes=3000)
+    page = "<html>" + "x" * 994
+    for i in range(5):
+        cache.set(f"page:{i}", page)
+
+    assert len(cache) == 2
+    assert cache.get("page:2") is None
+    assert cache.get("page:4") == page
+
+    # A value larger than the whole cache isn't kept
+    cache.set("huge", "x" * 5000)
+    assert cache.get("huge") is None
+    assert cache.get("page:4") == page
+
+
+def test_shared_between_instances(tmp_path):
+    """Test that separate cache objects on the same file see each other's entries."""
+    path = str(tmp_path / "cache.db")
+    SharedCache(path).set("key", "from worker 1")
+    assert SharedCache(path).get("key") == "from worker 1"
+
+
+def test_get_or_compute_runs_once_under_contention(tmp_path):
+    """Test that concurrent misses on one key compute the value only once."""
+    path = str(tmp_path / "cache.db")
+    calls = []
+    results = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return "computed"
+
+    def worker():
+        # A separate instance per thread, like separate uvicorn workers
+        results.append(SharedCache(path, poll_interval=0.01).get_or_compute("key", compute))
+
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == ["computed"] * 5
+
+
+def test_get_or_compute_does_not_cache_none(tmp_path):
+    """Test that failed computes are retried by the next caller."""
+    cache = SharedCache(str(tmp_path / "cache.db"))
+    assert cache.get_or_compute("key", lambda: None) is None
+    assert cache.get_or_compute("key", lambda: "retried") == "retried"
+
+
+def test_scrapers_reuse_cached_results(tmp_path, monkeypatch):
+    """Test that pages and analyses are fetched once when a cache is configured."""
+    cache = SharedCache(str(tmp_path / "cache.db"))
+    fetches = []
+
+    def fake_fetch(url):
+        fetches.append(url)
+        return ('<table><tbody><tr><td><a class="cmc-link">Bitcoin</a>'
+                '<p class="coin-item-symbol">BTC</p></td></tr></tbody></table>')
+
+    scraper = CoinMarketCapScraper(delay=0, cache=cache)
+    monkeypatch.setattr(scraper, "_fetch", fake_fetch)
+    assert "BTC" in scraper.get_top_cryptocurrencies(limit=1)
+    assert "BTC" in CoinMarketCapScraper(delay=0, cache=cache).get_top_cryptocurrencies(limit=1)
+    assert len(fetches) == 1
+
+    analyses = []
+
+    def fake_analyse(username):
+        analyses.append(username)
+        return ProfileAnalysis(
+            profile=Profile(username=username, name=username, bio="Bitcoin"),
+            analysis=MentionAnalysis(mentioned_cryptocurrencies={"BTC": 1}),
+        )
+
+    analyser = CryptoTwitterAnalyser(delay=0, cache=cache)
+    monkeypatch.setattr(analyser, "_analyse_profile", fake_analyse)
+    assert analyser.analyse_profile("user1").profile.bio == "Bitcoin"
+    assert analyser.analyse_profile("user1").profile.bio == "Bitcoin"
+    assert analyses == ["user1"]